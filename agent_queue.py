@@ -1,4 +1,3 @@
-import subprocess
 import string
 import re
 import random
@@ -7,15 +6,19 @@ import scipy.stats as stats
 import logging, sys
 import numpy as np
 import os
-import subprocess
 import json
-from multiprocessing.pool import ThreadPool
+
+import native_solver
+import solver_backends
+from solver_pool import SolverPool
 
 from utils import *
 from enum import Enum, IntEnum
 from private_culture import RandomCulture
 from boat_culture import BoatCulture
 from agent import Agent
+from argument import ArgumentationFramework, ArgumentationFrameworkView
+from base_culture import BLACK, WHITE
 from boat_agent import BoatAgent
 
 
@@ -103,22 +106,23 @@ class AgentQueue:
         and calculating skeptical acceptance of motion.
         :return: Sorted ground truth.
         """
+        native_solver.reset_fast_path_counts()
         ground_truth = copy.deepcopy(self)
         ground_truth.alteroceptive_framework = ground_truth.create_alteroceptive_framework()
         if debug:
             print("BASE BW FRAMEWORK:\n{}".format(ground_truth.alteroceptive_framework))
         status_quo = {}
+        base_view = ArgumentationFrameworkView(ground_truth.alteroceptive_framework)
         for i in range(0, len(ground_truth.queue)):
             for j in range(0, len(ground_truth.queue)):
                 if i == j:
                     continue
                 defender = ground_truth.queue[i]
                 challenger = ground_truth.queue[j]
-                alteroceptive_framework = copy.deepcopy(ground_truth.alteroceptive_framework)
 
                 to_remove = []
-                for argument_id in alteroceptive_framework.all_arguments:
-                    argument_obj = alteroceptive_framework.argument(argument_id)
+                for argument_obj in base_view.arguments():
+                    argument_id = argument_obj.id()
                     if is_black_arg(argument_id):
                         verified = argument_obj.verify(defender, challenger)
                     else:
@@ -126,9 +130,7 @@ class AgentQueue:
                     if not verified:
                         to_remove.append(argument_id)
 
-
-                for argument_id in to_remove:
-                    alteroceptive_framework.remove_argument(argument_id)
+                alteroceptive_framework = base_view.without(to_remove)
 
                 solver_result = alteroceptive_framework.run_solver(semantics="DS-PR", arg_str="1")
                 pair = (defender.id, challenger.id)
@@ -163,75 +165,83 @@ class AgentQueue:
         print("Ground truth: {}".format(ground_truth.queue_string()))
         print("GT Swaps: {}".format(swaps))
         print("Total yes: {}\nTotal no: {}".format(self.TOTAL_YES, self.TOTAL_NO))
+        logging.info("Solver fast path: {}".format(native_solver.fast_path_counts))
         return ground_truth, self.TOTAL_YES, swaps, status_quo
 
-    def compute_ground_truth_matrix(self):
+    def compute_ground_truth_matrix(self, incremental=False):
         """
         Computes the ground truth by removing all unverified arguments from BW framework
         and calculating skeptical acceptance of motion.
+        All pairs are solved together as masked copies of the same framework.
+        Always uses the native solver (native_solver.batch_accepted or incremental_accepted), whatever
+        ArgumentationFramework.solver_backend says; use compute_ground_truth_matrix_parallel for other backends.
+        :param incremental: Solve pairs one after the other in Gray code order of their verification masks,
+        relabelling only what changed (see native_solver.incremental_accepted), instead of in batches.
         :return: Sorted ground truth.
         """
+        native_solver.reset_fast_path_counts()
         ground_truth = copy.deepcopy(self)
         ground_truth.alteroceptive_framework = ground_truth.create_alteroceptive_framework()
         winners = {}
+        pairs = []
         for i in range(0, len(ground_truth.queue)):
             for j in range(0, len(ground_truth.queue)):
                 if i == j:
                     continue
-                defender = ground_truth.queue[i]
-                challenger = ground_truth.queue[j]
-                alteroceptive_framework = copy.deepcopy(ground_truth.alteroceptive_framework)
-
-                to_remove = []
-                for argument_id in alteroceptive_framework.all_arguments:
-                    argument_obj = alteroceptive_framework.argument(argument_id)
-                    if is_black_arg(argument_id):
-                        verified = argument_obj.verify(defender, challenger)
-                    else:
-                        verified = argument_obj.verify(challenger, defender)
-                    if not verified:
-                        to_remove.append(argument_id)
-                        # if is_verified_arg(argument_id):
-                        #     to_remove.append(argument_id - 2)
-
-                for argument_id in to_remove:
-                    alteroceptive_framework.remove_argument(argument_id)
-
-                solver_result = alteroceptive_framework.run_solver(semantics="DS-PR", arg_str="1")
-                if "YES" in solver_result:
-                    # Challenger wins.
-                    winners[(defender.id, challenger.id)] = challenger.id
-                    self.TOTAL_YES += 1
-                elif "NO" in solver_result:
-                    # Defender wins.
-                    winners[(defender.id, challenger.id)] = defender.id
-                    self.TOTAL_NO += 1
-                else:
-                    print("Error computing extensions")
+                pairs.append((ground_truth.queue[i], ground_truth.queue[j]))
+
+        masks = ground_truth.verification_masks(ground_truth.alteroceptive_framework, pairs)
+        solve = native_solver.incremental_accepted if incremental else native_solver.batch_accepted
+        accepted = solve(ground_truth.alteroceptive_framework, masks, 1, semantics="PR", skeptical=True)
+        for (defender, challenger), challenger_wins in zip(pairs, accepted):
+            if challenger_wins:
+                winners[(defender.id, challenger.id)] = challenger.id
+                self.TOTAL_YES += 1
+            else:
+                winners[(defender.id, challenger.id)] = defender.id
+                self.TOTAL_NO += 1
 
+        logging.info("Solver fast path: {}".format(native_solver.fast_path_counts))
         return winners
 
-    def compute_ground_truth_matrix_parallel(self):
+    def verification_masks(self, alteroceptive_framework, pairs):
+        """
+        Verifies every argument of a black-and-white framework for a list of (defender, challenger) pairs.
+        :param alteroceptive_framework: Black-and-white framework whose arguments are verified.
+        :param pairs: List of (defender, challenger) agents.
+        :return: Boolean matrix (pairs x arguments), columns in alteroceptive_framework.argument_ids() order.
+        """
+        masks = np.zeros((len(pairs), len(alteroceptive_framework.argument_ids())), dtype=bool)
+        for row, (defender, challenger) in enumerate(pairs):
+            masks[row] = alteroceptive_framework.verification_results(defender, challenger)
+        return masks
+
+    def compute_ground_truth_matrix_parallel(self, num_workers=None, timeout=None):
         """
         Computes the ground truth by removing all unverified arguments from BW framework
         and calculating skeptical acceptance of motion.
+        Pairs are solved by a pool of long-lived solver processes.
+        :param num_workers: Number of solver processes. Defaults to the number of CPUs.
+        :param timeout: Seconds allowed per pair before its solver process is restarted.
         :return: Sorted ground truth.
         """
+        native_solver.reset_fast_path_counts()
         ground_truth = copy.deepcopy(self)
         ground_truth.alteroceptive_framework = ground_truth.create_alteroceptive_framework()
         winners = {}
         pairs = []
+        base_view = ArgumentationFrameworkView(ground_truth.alteroceptive_framework)
         for i in range(0, len(ground_truth.queue)):
             for j in range(0, len(ground_truth.queue)):
                 if i == j:
                     continue
-                defender = ground_truth.queue[i]
-                challenger = ground_truth.queue[j]
-                alteroceptive_framework = copy.deepcopy(ground_truth.alteroceptive_framework)
+                pairs.append((ground_truth.queue[i], ground_truth.queue[j]))
 
+        def pair_requests():
+            for defender, challenger in pairs:
                 to_remove = []
-                for argument_id in alteroceptive_framework.all_arguments:
-                    argument_obj = alteroceptive_framework.argument(argument_id)
+                for argument_obj in base_view.arguments():
+                    argument_id = argument_obj.id()
                     if is_black_arg(argument_id):
                         verified = argument_obj.verify(defender, challenger)
                     else:
@@ -241,44 +251,27 @@ class AgentQueue:
                         # if is_verified_arg(argument_id):
                         #     to_remove.append(argument_id - 2)
 
-                for argument_id in to_remove:
-                    alteroceptive_framework.remove_argument(argument_id)
-
-                filename = "temp_frameworks/{}-{}.apx".format(defender.id, challenger.id)
-                with open(filename, 'w') as file:
-                    file.write(alteroceptive_framework.to_aspartix_id())
-                pairs.append((defender.id, challenger.id))
-
-        def run_solver_detached(pair):
-            defender, challenger = pair
-            filename = "temp_frameworks/{}-{}.apx".format(defender, challenger)
-            solver_location = "mu-toksia/mu-toksia.exe"
-            semantics = "DS-PR"
-            arg_str = "1"
-            result = subprocess.run([solver_location, "-p", semantics, "-fo", "apx", "-f", filename,
-                                     "-a", arg_str],
-                                    capture_output=True, text=True)
-            return result.stdout
-
-        thread_pool = ThreadPool()
-        solver_results = thread_pool.map(run_solver_detached, pairs)
-        thread_pool.close()
-        thread_pool.join()
-        results = list(zip(solver_results, pairs))
-
-        for result in results:
-            solver_result, (defender, challenger) = result
+                alteroceptive_framework = base_view.without(to_remove)
+                yield (defender.id, challenger.id), alteroceptive_framework, "DS-PR", "1"
+
+        command = solver_backends.get(ArgumentationFramework.solver_backend, base_view, "DS-PR").command
+        with SolverPool(num_workers=num_workers, command=command, timeout=timeout) as pool:
+            solver_results = dict(pool.imap_unordered(pair_requests()))
+
+        for defender, challenger in pairs:
+            solver_result = solver_results[(defender.id, challenger.id)] or ""
             if "YES" in solver_result:
                 # Challenger wins.
-                winners[(defender, challenger)] = challenger
+                winners[(defender.id, challenger.id)] = challenger.id
                 self.TOTAL_YES += 1
             elif "NO" in solver_result:
                 # Defender wins.
-                winners[(defender, challenger)] = defender
+                winners[(defender.id, challenger.id)] = defender.id
                 self.TOTAL_NO += 1
             else:
                 print("Error computing extensions")
 
+        logging.info("Solver fast path: {}".format(native_solver.fast_path_counts))
         return winners
 
     def relative_queue(self, ground_truth):
@@ -380,20 +373,10 @@ class AgentQueue:
         Prunes unverified arguments out of a black-and-white framework.
         :param defender: Agent representing black arguments.
         :param challenger: Agent representing white arguments.
-        :return: Black-and-white framework with unverified arguments removed.
+        :return: Frozen black-and-white framework with unverified arguments removed, shared with the culture.
         """
-        alteroceptive_framework = copy.deepcopy(self.culture.raw_alteroceptive_framework)
-
-        # Delete defender's motion since challenger always proposes motion.
-        alteroceptive_framework.remove_argument(0)
-        # Delete motion verifiers.
-        alteroceptive_framework.remove_argument(2)
-        alteroceptive_framework.remove_argument(3)
-
-        alteroceptive_framework.rank_least_attacked_arguments()
-        alteroceptive_framework.rank_strongest_attacker_arguments()
-
-        return alteroceptive_framework
+        # Delete defender's motion since challenger always proposes motion, and the motion verifiers.
+        return self.culture.frozen_alteroceptive_framework([0, 2, 3])
 
     def interact_pair(self, defender: Agent, challenger: Agent):
         """
@@ -455,23 +438,24 @@ class AgentQueue:
                                                                        challenger.id, privacy_budget[challenger]))
 
             # Remove previously used arguments.
+            framework = self.alteroceptive_framework
             all_used_arguments = used_arguments[player] + used_arguments[opponent]
-            forbidden_arguments = set(all_used_arguments)
+            forbidden_arguments = framework.mask(all_used_arguments)
             # Cannot pick argument that is attacked by previously used argument.
-            forbidden_arguments.update(self.alteroceptive_framework.arguments_attacked_by_list(all_used_arguments))
-            unverified_argument_ids = self.alteroceptive_framework.arguments_that_attack(last_argument[opponent])
-            unverified_argument_ids = unverified_argument_ids.difference(forbidden_arguments)
+            forbidden_arguments |= framework.attacks_mask_of(all_used_arguments)
+            # Defender plays black arguments, challenger white ones. Candidates are dense indices (ids only at the
+            # boundary), cheapest first, ties in framework order (not in set iteration order, as before frozen
+            # frameworks), so LEAST_COST_* strategies break ties deterministically.
+            colour = BLACK if player == defender else WHITE
+            candidates = framework.attacker_indices_by_cost(last_argument[opponent], colour,
+                                                            exclude=forbidden_arguments)
             if self.strategy != ArgStrategy.ALL_ARGS:
                 logging.debug(
-                    "Possible attackers to argument {}: {}".format(last_argument[opponent], unverified_argument_ids))
-            verified_argument_ids = []
-            for argument_id in unverified_argument_ids:
-                argument_obj = self.alteroceptive_framework.argument(argument_id)
-                # We will verify each argument using their respective verifier function.
-                if (player == defender and is_black_arg(argument_id)) or \
-                        (player == challenger and is_white_arg(argument_id)):
-                    if argument_obj.verify(player, opponent):
-                        verified_argument_ids.append(argument_id)
+                    "Possible attackers to argument {}: {}".format(last_argument[opponent],
+                                                                  framework.ids_at(candidates)))
+            # We will verify each argument using their respective verifier function.
+            verified = candidates[framework.verify_indices(candidates, player, opponent)]
+            verified_argument_ids = framework.ids_at(verified)
 
             # No local unfairness here. Agent had no counter-argument, regardless of privacy budget.
             if not verified_argument_ids:
@@ -484,20 +468,11 @@ class AgentQueue:
 
             logging.debug("Agent {} verified arguments {}".format(player.id, verified_argument_ids))
 
-            affordable_argument_ids = []
-            affordable_str = "Affordable arguments cost: "
-            for argument_id in verified_argument_ids:
-                argument_obj = self.alteroceptive_framework.argument(argument_id)
-                if argument_obj.privacy_cost <= privacy_budget[player]:
-                    player_is_defender = (player == defender)
-                    if player_is_defender and is_black_arg(
-                            argument_id):  # Black agent. Only even arguments are considered.
-                        affordable_argument_ids.append(argument_id)
-                    elif (not player_is_defender) and is_white_arg(
-                            argument_id):  # White agent. Only odd arguments are considered.
-                        affordable_argument_ids.append(argument_id)
-                    affordable_str += "arg {}: {} | ".format(argument_id, argument_obj.privacy_cost)
-            logging.debug(affordable_str)
+            affordable = verified[framework.privacy_costs[verified] <= privacy_budget[player]]
+            affordable_argument_ids = framework.ids_at(affordable)
+            logging.debug("Affordable arguments cost: " + "".join(
+                "arg {}: {} | ".format(argument_id, framework.privacy_cost(argument_id))
+                for argument_id in affordable_argument_ids))
 
             # If there are no affordable arguments, player loses and local unfairness increases.
 
@@ -511,18 +486,18 @@ class AgentQueue:
                     logging.debug("Agent {} wins!".format(winner.id))
                     logging.debug("Used arguments: {}".format(used_arguments[winner]))
                     break
-                # Random choice within privacy budget.
-                rebuttal_id = random.choice(affordable_argument_ids)
+                # Random choice within privacy budget, among the candidates in framework order.
+                rebuttal_id = random.choice(framework.ids_at(np.sort(affordable)))
                 logging.debug("Agent {} randomly chose argument {}".format(player.id, rebuttal_id))
                 last_argument[player] = [rebuttal_id]
                 used_arguments[player].append(rebuttal_id)
-                rebuttal_obj = self.alteroceptive_framework.argument(rebuttal_id)
+                rebuttal_obj = framework.argument(rebuttal_id)
                 # print("Agent {}: {}".format(player.id, rebuttal_obj.descriptive_text))
                 privacy_budget[player] -= rebuttal_obj.privacy_cost
 
             elif self.strategy == ArgStrategy.RANDOM_CHOICE_NO_PRIVACY:
-                # Random choice within verified arguments.
-                rebuttal_id = random.choice(verified_argument_ids)
+                # Random choice within verified arguments, in framework order.
+                rebuttal_id = random.choice(framework.ids_at(np.sort(verified)))
                 logging.debug("Agent {} randomly chose argument {}".format(player.id, rebuttal_id))
                 last_argument[player] = [rebuttal_id]
                 used_arguments[player].append(rebuttal_id)
@@ -538,24 +513,16 @@ class AgentQueue:
                     logging.debug("Agent {} wins!".format(winner.id))
                     logging.debug("Used arguments: {}".format(used_arguments[winner]))
                     break
-                # Deterministic choice with cheaper arguments first.
-                cheaper_argument_obj = self.alteroceptive_framework.argument(affordable_argument_ids[0])
-                for arg_id in affordable_argument_ids:
-                    arg_obj = self.alteroceptive_framework.argument(arg_id)
-                    if arg_obj.privacy_cost < cheaper_argument_obj.privacy_cost:
-                        cheaper_argument_obj = arg_obj
+                # Deterministic choice with cheaper arguments first. Candidates are already sorted by privacy cost.
+                cheaper_argument_obj = framework.argument(affordable_argument_ids[0])
                 last_argument[player] = [cheaper_argument_obj.id()]
                 logging.debug("Agent {} chose cheapest argument {}".format(player.id, last_argument[player]))
                 used_arguments[player].append(cheaper_argument_obj.id())
                 privacy_budget[player] -= cheaper_argument_obj.privacy_cost
 
             elif self.strategy == ArgStrategy.LEAST_COST_NO_PRIVACY:
-                # Deterministic choice with cheaper arguments first.
-                cheaper_argument_obj = self.alteroceptive_framework.argument(verified_argument_ids[0])
-                for arg_id in verified_argument_ids:
-                    arg_obj = self.alteroceptive_framework.argument(arg_id)
-                    if arg_obj.privacy_cost < cheaper_argument_obj.privacy_cost:
-                        cheaper_argument_obj = arg_obj
+                # Deterministic choice with cheaper arguments first. Candidates are already sorted by privacy cost.
+                cheaper_argument_obj = framework.argument(verified_argument_ids[0])
                 last_argument[player] = [cheaper_argument_obj.id()]
                 logging.debug("Agent {} chose cheapest argument {}".format(player.id, last_argument[player]))
                 used_arguments[player].append(cheaper_argument_obj.id())
@@ -571,27 +538,15 @@ class AgentQueue:
                     logging.debug("Used arguments: {}".format(used_arguments[winner]))
                     break
 
-                ranking = self.alteroceptive_framework.least_attacked
-                rebuttal_id = -1
-                alteroceptive_argument_id = -1
-                for alteroceptive_argument_id in ranking:
-                    if alteroceptive_argument_id in affordable_argument_ids:
-                        break
-                # Convert bw id to normal id.
-                rebuttal_id = alteroceptive_argument_id
-                rebuttal_obj = self.alteroceptive_framework.argument(rebuttal_id)
+                rebuttal_id = framework.ids[affordable[np.argmin(framework.least_attacked_positions[affordable])]]
+                rebuttal_obj = framework.argument(rebuttal_id)
                 last_argument[player] = [rebuttal_id]
                 logging.debug("Agent {} chose least attacked argument {}".format(player.id, last_argument[player]))
                 used_arguments[player].append(rebuttal_id)
                 privacy_budget[player] -= rebuttal_obj.privacy_cost
 
             elif self.strategy == ArgStrategy.LEAST_ATTACKERS_NO_PRIVACY:
-                ranking = self.alteroceptive_framework.least_attacked
-                alteroceptive_argument_id = -1
-                for alteroceptive_argument_id in ranking:
-                    if alteroceptive_argument_id in verified_argument_ids:
-                        break
-                rebuttal_id = alteroceptive_argument_id
+                rebuttal_id = framework.ids[verified[np.argmin(framework.least_attacked_positions[verified])]]
                 last_argument[player] = [rebuttal_id]
                 logging.debug("Agent {} chose least attacked argument {}".format(player.id, last_argument[player]))
                 used_arguments[player].append(rebuttal_id)
@@ -607,34 +562,22 @@ class AgentQueue:
                     logging.debug("Used arguments: {}".format(used_arguments[winner]))
                     break
 
-                ranking = self.alteroceptive_framework.strongest_attackers
-                rebuttal_id = -1
-                alteroceptive_argument_id = -1
-                for alteroceptive_argument_id in ranking:
-                    if alteroceptive_argument_id in affordable_argument_ids:
-                        break
-                # Convert bw id to normal id.
-                rebuttal_id = alteroceptive_argument_id
-                rebuttal_obj = self.alteroceptive_framework.argument(rebuttal_id)
+                rebuttal_id = framework.ids[affordable[np.argmin(framework.strongest_attacker_positions[affordable])]]
+                rebuttal_obj = framework.argument(rebuttal_id)
                 last_argument[player] = [rebuttal_id]
                 logging.debug("Agent {} chose most attacking argument {}".format(player.id, last_argument[player]))
                 used_arguments[player].append(rebuttal_id)
                 privacy_budget[player] -= rebuttal_obj.privacy_cost
 
             elif self.strategy == ArgStrategy.MOST_ATTACKS_NO_PRIVACY:
-                ranking = self.alteroceptive_framework.strongest_attackers
-                alteroceptive_argument_id = -1
-                for alteroceptive_argument_id in ranking:
-                    if alteroceptive_argument_id in verified_argument_ids:
-                        break
-                rebuttal_id = alteroceptive_argument_id
+                rebuttal_id = framework.ids[verified[np.argmin(framework.strongest_attacker_positions[verified])]]
                 last_argument[player] = [rebuttal_id]
                 logging.debug("Agent {} chose most attacking argument {}".format(player.id, last_argument[player]))
                 used_arguments[player].append(rebuttal_id)
 
             elif self.strategy == ArgStrategy.ALL_ARGS:
                 # Use all arguments as possible.
-                attacked_arguments = set(self.alteroceptive_framework.arguments_attacked_by_list(verified_argument_ids))
+                attacked_arguments = set(framework.arguments_attacked_by_list(verified_argument_ids))
                 last_arguments = set(last_argument[opponent])
                 if last_arguments.issubset(attacked_arguments):
                     logging.debug("Agent {} chose arguments {}".format(player.id, verified_argument_ids))
@@ -1,7 +1,11 @@
-import subprocess
 import string
 import re
-# import graph_tool.all as gt
+import numpy as np
+import framework_io
+import native_solver
+import power_index
+import solver_backends
+from sparse_graph import SparseGraph
 
 class Argument:
     """
@@ -77,6 +81,13 @@ class ArgumentationFramework:
     """
     An argumentation framework is represented as a directed graph on Arguments.
     """
+    # Name of a backend registered in solver_backends ("native", "mu-toksia", "batch", "cached"), or "auto" to
+    # choose by framework size and semantics. Problems a backend does not support fall back to the automatic choice.
+    solver_backend = "auto"
+    # Set to a SolverCache to memoise the results of run_solver, shared by all frameworks. Off by default: on small
+    # frameworks computing the cache key costs about as much as solving.
+    solver_cache = None
+
     def __init__(self):
         self.all_arguments = {}
         self.all_attacks = {}
@@ -84,6 +95,11 @@ class ArgumentationFramework:
         self.argument_strength = {}
         self.least_attacked = []
         self.strongest_attackers = []
+        # Degrees and first-insertion order of every id, kept up to date by add_attack and remove_argument.
+        self.in_degree = {}
+        self.out_degree = {}
+        self.sequence = {}
+        self.next_sequence = 0
 
     def add_arguments(self, arguments: list):
         for arg in arguments:
@@ -102,21 +118,39 @@ class ArgumentationFramework:
         return self.all_attacked_by
 
     def remove_argument(self, argument_id):
-        if argument_id in self.all_arguments.keys():
-            del self.all_arguments[argument_id]
-        if argument_id in self.all_attacks.keys():
-            del self.all_attacks[argument_id]
-        if argument_id in self.all_attacked_by.keys():
-            del self.all_attacked_by[argument_id]
-        for id, attacked_set in self.all_attacks.items():
-            if argument_id in attacked_set:
-                attacked_set.remove(argument_id)
-        for id, attacker_set in self.all_attacked_by.items():
-            if argument_id in attacker_set:
-                attacker_set.remove(argument_id)
+        self.remove_arguments([argument_id])
+
+    def remove_arguments(self, argument_ids):
+        """
+        Removes arguments and all their attacks in a single pass.
+        Only the neighbours of removed arguments are visited, through all_attacks and all_attacked_by.
+        :param argument_ids: Iterable of argument ids to be removed.
+        """
+        removed = set(argument_ids)
+        for argument_id in removed:
+            if argument_id in self.all_arguments.keys():
+                del self.all_arguments[argument_id]
+            for attacked_id in self.all_attacks.pop(argument_id, ()):
+                if attacked_id not in removed:
+                    self.all_attacked_by[attacked_id].remove(argument_id)
+                    self.in_degree[attacked_id] -= 1
+            for attacker_id in self.all_attacked_by.pop(argument_id, ()):
+                if attacker_id not in removed:
+                    self.all_attacks[attacker_id].remove(argument_id)
+                    self.out_degree[attacker_id] -= 1
+            for index in (self.in_degree, self.out_degree, self.sequence):
+                index.pop(argument_id, None)
+
+    def register_id(self, argument_id):
+        if argument_id not in self.sequence:
+            self.sequence[argument_id] = self.next_sequence
+            self.next_sequence += 1
+            self.in_degree[argument_id] = 0
+            self.out_degree[argument_id] = 0
 
     def add_argument(self, argument):
         self.all_arguments[argument.id()] = argument
+        self.register_id(argument.id())
         argument.set_framework(self)
 
     def add_attack(self, attacker_id, attacked_id):
@@ -124,9 +158,39 @@ class ArgumentationFramework:
             self.all_attacks[attacker_id] = set()
         if self.all_attacked_by.get(attacked_id, None) is None:
             self.all_attacked_by[attacked_id] = set()
+        self.register_id(attacker_id)
+        self.register_id(attacked_id)
+        if attacked_id not in self.all_attacks[attacker_id]:
+            self.out_degree[attacker_id] += 1
+            self.in_degree[attacked_id] += 1
         self.all_attacks[attacker_id].add(attacked_id)
         self.all_attacked_by[attacked_id].add(attacker_id)
 
+    def add_attacks(self, attacker_ids, attacked_ids):
+        """
+        Adds many attacks at once, grouping them by attacker and by attacked argument.
+        Equivalent to calling add_attack on each pair.
+        :param attacker_ids: Attacker id of each attack (sequence or array).
+        :param attacked_ids: Attacked id of each attack.
+        """
+        attacker_ids = np.asarray(attacker_ids, dtype=np.int64)
+        attacked_ids = np.asarray(attacked_ids, dtype=np.int64)
+        # Register new ids in the order add_attack would have.
+        interleaved = np.column_stack([attacker_ids, attacked_ids]).ravel()
+        unique_ids, first = np.unique(interleaved, return_index=True)
+        for arg_id in unique_ids[np.argsort(first)].tolist():
+            self.register_id(arg_id)
+        for keys, values, adjacency, degree in ((attacker_ids, attacked_ids, self.all_attacks, self.out_degree),
+                                                (attacked_ids, attacker_ids, self.all_attacked_by, self.in_degree)):
+            order = np.argsort(keys, kind="stable")
+            keys, values = keys[order], values[order]
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.zeros(0, dtype=int)
+            for key, group in zip(keys[starts].tolist(), np.split(values, starts[1:])):
+                neighbours = adjacency.setdefault(key, set())
+                before = len(neighbours)
+                neighbours.update(group.tolist())
+                degree[key] += len(neighbours) - before
+
     def arguments_that_attack(self, argument):
         """
         Returns all other arguments that attack the parameter argument.
@@ -172,106 +236,553 @@ class ArgumentationFramework:
     def argument(self, argument_id):
         return self.all_arguments[argument_id]
 
-    def compute_rank_arguments_occurrence(self, semantics="EE-PR"):
+    def privacy_cost(self, argument_id):
+        return self.argument(argument_id).privacy_cost
+
+    def compute_rank_arguments_occurrence(self, semantics="EE-PR", backend=None, max_extensions=None,
+                                          error=None, confidence=0.95):
         """
-        Calls ConArg as an external process to compute extensions.
+        Computes extensions, in process or with an external solver (see run_solver).
         Returns a normalised "argument strength" value denoted by occurrences/num_extensions.
         :param semantics: The type of semantics to be considered.
+        :param backend: Name of a solver backend. Defaults to the class-wide solver_backend.
+        :param max_extensions: Raise a RuntimeError rather than count more extensions than this (native solver only).
+        :param error: If set, estimate strengths by sampling preferred extensions instead of enumerating them, to
+        within +/- error at the given confidence (see native_solver.estimate_occurrence).
+        :param confidence: Confidence level of the sampled estimates.
         :return: Argument strengths as percentage of occurrence.
         """
-        result_string = self.run_solver(semantics)
-        result_string = result_string.replace("[", "")
-        result_string = result_string.replace("]", "")
-        result_string = result_string.replace("\t", "")
-        match = result_string.split("\n")
-        occurrences = {}
-        for argument_obj in self.arguments():
-            occurrences[argument_obj.id()] = 0
-        for m in match:
-            for argument_obj in self.arguments():
-                arg_id = argument_obj.id()
-                # FIXME: Finding individual digits in strings, flawed counting
-                if str(arg_id) in m.split(","):
-                    occurrences[arg_id] += 1
-        num_extensions = len(match)
-
-        argument_strength = {}
-        for id, count in occurrences.items():
-            if num_extensions == 0:
-                num_extensions = 1
-            argument_strength[id] = count / num_extensions
-
-        self.argument_strength = argument_strength
-
-    def run_solver(self, semantics="EE-PR", arg_str=""):
-        """
-        Runs the mu-toksia solver to check if an argument is part of the extension given by the semantics.
+        backend = backend if backend else self.solver_backend
+        ids = list(self.argument_ids())
+        if error is not None:
+            if semantics != "EE-PR":
+                raise ValueError("Sampled strengths are only available for EE-PR")
+            frequencies, _, _ = native_solver.estimate_occurrence(self, error, confidence)
+            self.argument_strength = dict(zip(ids, frequencies.tolist()))
+            return
+        if isinstance(solver_backends.get(backend, self, semantics), solver_backends.NativeBackend):
+            bitsets = native_solver.extension_bitsets(self, semantics.split("-")[1], max_extensions=max_extensions)
+            chunks = native_solver.bitset_incidence_chunks(bitsets, len(ids))
+        else:
+            extensions = native_solver.parse_extensions(self.run_solver(semantics, backend=backend))
+            chunks = native_solver.incidence_chunks(extensions, ids)
+
+        occurrences = np.zeros(len(ids), dtype=np.int64)
+        num_extensions = 0
+        for incidence in chunks:
+            occurrences += incidence.sum(axis=0)
+            num_extensions += len(incidence)
+        if num_extensions == 0:
+            num_extensions = 1
+
+        self.argument_strength = dict(zip(ids, (occurrences / num_extensions).tolist()))
+
+    def compute_rank_power_index(self, index="SV", semantics="EE-PR", num_samples=None):
+        """
+        Ranks arguments by a power index over the extensions (see power_index.py).
+        The IN index of each argument becomes its "argument strength".
+        :param index: "SV" (Shapley value) or "BI" (Banzhaf index).
+        :param semantics: The type of semantics to be considered.
+        :param num_samples: If set, estimate the indices by Monte Carlo sampling instead of computing them exactly.
+        :return: List of argument ids, strongest first.
+        """
+        power = power_index.compute_power_index(self, index, semantics.split("-")[1], num_samples)
+        self.argument_strength = {arg_id: values[0] for arg_id, values in power.items()}
+        return power_index.rank(power)
+
+    def run_solver(self, semantics="EE-PR", arg_str="", backend=None):
+        """
+        Runs the solver to check if an argument is part of the extension given by the semantics.
         :param semantics: The type of semantics to be considered.
         :param arg_str: The string defining the argument.
+        :param backend: Name of a solver backend. Defaults to the class-wide solver_backend.
         :return: stdout output of the solver (likely "YES" or "NO").
         """
-        with open('sample.apx',  'w') as file:
-            file.write(self.to_aspartix_id())
-
+        backend = backend if backend else self.solver_backend
+        framework = self
+        if native_solver.kernel_applies(semantics, arg_str):
+            framework, _ = self.kernelize(int(arg_str))
+        if self.solver_cache is not None:
+            return self.solver_cache.solve(framework, semantics, arg_str,
+                                           lambda framework, sem, arg: framework.run_solver_uncached(sem, arg, backend))
+        return framework.run_solver_uncached(semantics, arg_str, backend)
+
+    def run_solver_uncached(self, semantics, arg_str, backend):
+        """
+        Same as run_solver, bypassing solver_cache.
+        Problems settled by the grounded labelling are answered in process, whatever the backend.
+        """
+        answer = native_solver.well_founded_answer(self, semantics, arg_str)
+        if answer is not None:
+            return answer
         # subprocess.run(["conarg_x64/conarg2", "-w dung", "-e admissible", "-c 4", "sample.apx"])
-        if not arg_str:
-            result = subprocess.run(["mu-toksia/mu-toksia.exe", "-p", semantics, "-fo", "apx", "-f", "sample.apx"],
-                                    capture_output=True, text=True)
-        else:
-            result = subprocess.run(["mu-toksia/mu-toksia.exe", "-p", semantics, "-fo", "apx", "-f", "sample.apx",
-                                     "-a", arg_str],
-                                    capture_output=True, text=True)
+        backend = solver_backends.get(backend, self, semantics)
+        if isinstance(backend, solver_backends.CachedBackend) and backend.cache is None:
+            # run_solver has already looked this problem up in solver_cache.
+            backend = backend.backend
+        return backend.solve(self, semantics, arg_str)
 
-        if result.stderr:  # some error
-            raise RuntimeError('Failed to compute extension: {}'.format(result.stderr))
+    def kernelize(self, argument_id=1):
+        """
+        Reduces the framework before asking whether argument_id is (skeptically or credulously) accepted under
+        grounded, complete or preferred semantics. See native_solver.kernel_dense.
+        :param argument_id: The query argument.
+        :return: Tuple (kernel, mapping): an ArgumentationFrameworkView with the kept arguments, and a dict from each
+        kept argument id to the list of original ids it stands for.
+        """
+        ids, index, attackers, attacked = native_solver.dense_graph(self)
+        view = self if isinstance(self, ArgumentationFrameworkView) else ArgumentationFrameworkView(self)
+        if argument_id not in index:
+            # An absent argument is accepted under no semantics, and the empty kernel answers NO.
+            return view.without(ids), {}
+        kept, groups = native_solver.kernel_dense(attackers, attacked, index[argument_id])
+        kept = set(kept)
+        kernel = view.without(ids[i] for i in range(len(ids)) if i not in kept)
+        mapping = {ids[i]: [ids[j] for j in members] for i, members in groups.items()}
+        return kernel, mapping
+
+    def least_attacked_rank(self, argument_id):
+        """
+        Sort key of an argument in the least attacked ranking. Ties keep insertion order.
+        """
+        return self.in_degree[argument_id], self.sequence[argument_id]
 
-        return result.stdout
+    def strongest_attacker_rank(self, argument_id):
+        """
+        Sort key of an argument in the strongest attacker ranking. Ties keep insertion order.
+        """
+        return -self.out_degree[argument_id], self.sequence[argument_id]
 
     def rank_least_attacked_arguments(self):
         """
         :return: List of argument ids in ascending order of attacks received.
+        Ids that only appear in attacks are left out.
         """
-        rank = {}
-        for arg_id in self.all_arguments:
-            rank[arg_id] = 0
-        for arg_id, attackers in self.all_attacked_by.items():
-            rank[arg_id] = len(attackers)
-        self.least_attacked = sorted(rank, key=rank.get)
+        self.least_attacked = sorted(self.all_arguments, key=self.least_attacked_rank)
 
     def rank_strongest_attacker_arguments(self):
         """
-        :return: List of argument ids in ascending order of attacks received.
+        :return: List of argument ids in descending order of attacks made.
+        Ids that only appear in attacks are left out.
         """
-        rank = {}
-        for arg_id in self.all_arguments:
-            rank[arg_id] = 0
-        for arg_id, attacks in self.all_attacks.items():
-            rank[arg_id] = len(attacks)
-        self.strongest_attackers = sorted(rank, key=rank.get, reverse=True)
+        self.strongest_attackers = sorted(self.all_arguments, key=self.strongest_attacker_rank)
+
+    def freeze(self):
+        """
+        :return: An immutable, array-backed snapshot of this framework.
+        """
+        return FrozenArgumentationFramework(self)
+
+    def to_sparse(self):
+        """
+        :return: A SparseGraph (scipy.sparse adapter) of the current attacks.
+        """
+        return SparseGraph(self)
 
     def to_aspartix_id(self):
-        text = ""
-        for argument in self.all_arguments:
-            text += "arg({}).\n".format(argument)
-        for attacker in self.all_attacks.keys():
-            for attacked in self.all_attacks[attacker]:
-                text += "att({},{}).\n".format(attacker, attacked)
-        return text
+        return "".join(framework_io.aspartix_lines(self))
 
     def to_aspartix_text(self):
-        text = ""
-        for argument_id in self.all_arguments:
-            arg_text = self.argument(argument_id).descriptive_text
-            text += "arg({}).\n".format(arg_text)
-        for attacker_id in self.all_attacks.keys():
-            for attacked_id in self.all_attacks[attacker_id]:
-                attacker_text = self.argument(attacker_id).descriptive_text
-                attacked_text = self.argument(attacked_id).descriptive_text
-                text += "att({},{}).\n".format(attacker_text, attacked_text)
-        return text
+        return "".join(framework_io.aspartix_lines(self, descriptive=True))
+
+    @classmethod
+    def from_arrays(cls, ids, costs, sources, targets):
+        """
+        Builds a framework of PrivateArguments from parallel arrays, e.g. as returned by framework_io.load_binary.
+        Verifier functions are not part of the arrays and must be set afterwards.
+        :param ids: Argument ids.
+        :param costs: Privacy cost of each argument.
+        :param sources: Attacker id of each attack.
+        :param targets: Attacked id of each attack.
+        """
+        framework = cls()
+        for arg_id, cost in zip(ids.tolist(), costs.tolist()):
+            framework.add_argument(PrivateArgument(arg_id=arg_id, descriptive_text=str(arg_id), privacy_cost=cost))
+        framework.add_attacks(sources, targets)
+        return framework
+
+
+class DerivedArgumentationFramework(ArgumentationFramework):
+    """
+    Base of read-only frameworks computed on demand from another framework (see ArgumentationFrameworkView).
+    Subclasses provide argument_ids, argument, arguments_that_attack, arguments_attacked_by, remove_arguments and
+    rank_key, the tie-breaking sort key of an argument in the rankings.
+    """
+    def least_attacked_rank(self, argument_id):
+        return len(self.arguments_that_attack(argument_id)), self.rank_key(argument_id)
+
+    def strongest_attacker_rank(self, argument_id):
+        return -len(self.arguments_attacked_by(argument_id)), self.rank_key(argument_id)
+
+    def rank_least_attacked_arguments(self):
+        self.least_attacked = sorted(self.argument_ids(), key=self.least_attacked_rank)
+
+    def rank_strongest_attacker_arguments(self):
+        self.strongest_attackers = sorted(self.argument_ids(), key=self.strongest_attacker_rank)
+
+    @property
+    def all_arguments(self):
+        return {arg_id: self.argument(arg_id) for arg_id in self.argument_ids()}
+
+    @property
+    def all_attacks(self):
+        attacks = {arg_id: self.arguments_attacked_by(arg_id) for arg_id in self.argument_ids()}
+        return {arg_id: attacked_set for arg_id, attacked_set in attacks.items() if attacked_set}
+
+    @property
+    def all_attacked_by(self):
+        attacked_by = {arg_id: self.arguments_that_attack(arg_id) for arg_id in self.argument_ids()}
+        return {arg_id: attacker_set for arg_id, attacker_set in attacked_by.items() if attacker_set}
+
+    def arguments(self):
+        return [self.argument(arg_id) for arg_id in self.argument_ids()]
+
+    def attacks(self):
+        return self.all_attacks
+
+    def attacked_by(self):
+        return self.all_attacked_by
+
+    def add_argument(self, argument):
+        raise TypeError("{} is read-only".format(type(self).__name__))
+
+    def add_attack(self, attacker_id, attacked_id):
+        raise TypeError("{} is read-only".format(type(self).__name__))
+
+    def add_attacks(self, attacker_ids, attacked_ids):
+        raise TypeError("{} is read-only".format(type(self).__name__))
+
+
+class ArgumentationFrameworkView(DerivedArgumentationFramework):
+    """
+    A read-only view of an ArgumentationFramework restricted to a subset of its arguments.
+    The active arguments are kept as bits of an integer, so pruning a view never copies the base framework.
+    The base framework must not be modified while views of it are in use.
+    """
+    def __init__(self, base, active=None, index=None):
+        """
+        :param base: The framework being viewed.
+        :param active: Bitset of active arguments. All arguments are active by default.
+        :param index: Mapping from argument id to bit position, shared between views of the same base.
+        """
+        self.base = base
+        if index is None:
+            # Views of a frozen framework share its dense indices, so attack bitmasks can be used directly.
+            index = base.index if isinstance(base, FrozenArgumentationFramework) else \
+                {arg_id: bit for bit, arg_id in enumerate(base.argument_ids())}
+        self.index = index
+        self.active = active if active is not None else (1 << len(self.index)) - 1
+        # (active, dense graph) of the last dense_graph call. Views can still lose arguments via remove_arguments.
+        self.__dense_graph = None
+        self.argument_strength = {}
+        self.least_attacked = []
+        self.strongest_attackers = []
+
+    def rank_key(self, argument_id):
+        return self.index[argument_id]
+
+    def is_active(self, argument_id):
+        bit = self.index.get(argument_id)
+        return bit is not None and (self.active >> bit) & 1 == 1
+
+    def without(self, argument_ids):
+        """
+        :param argument_ids: Arguments to be left out.
+        :return: A new view over the same base, without the given arguments.
+        """
+        active = self.active
+        for argument_id in argument_ids:
+            bit = self.index.get(argument_id)
+            if bit is not None:
+                active &= ~(1 << bit)
+        return ArgumentationFrameworkView(self.base, active, self.index)
 
+    def argument_ids(self):
+        if isinstance(self.base, FrozenArgumentationFramework):
+            return self.base.ids_of(self.active)
+        return [arg_id for arg_id in self.base.argument_ids() if self.is_active(arg_id)]
+
+    def dense_graph(self):
+        """
+        For views of a frozen framework, slices the base CSR arrays by the active arguments instead of asking for the
+        attackers of each argument in turn.
+        :return: Tuple (ids, index, attackers, attacked) as expected by native_solver.
+        """
+        if not isinstance(self.base, FrozenArgumentationFramework):
+            return native_solver.adjacency_lists(self)
+        if self.__dense_graph is None or self.__dense_graph[0] != self.active:
+            base = self.base
+            keep = base.mask_to_array(self.active, len(base.ids))
+            kept = np.flatnonzero(keep)
+            remap = np.cumsum(keep) - 1
+            ids = [base.ids[i] for i in kept.tolist()]
+            index = {arg_id: i for i, arg_id in enumerate(ids)}
+            attackers = self.sliced_rows(base.attacked_by_indptr, base.attacked_by_indices, keep, remap, len(kept))
+            attacked = self.sliced_rows(base.attacks_indptr, base.attacks_indices, keep, remap, len(kept))
+            self.__dense_graph = (self.active, (ids, index, attackers, attacked))
+        return self.__dense_graph[1]
+
+    @staticmethod
+    def sliced_rows(indptr, indices, keep, remap, size):
+        """
+        :return: The rows of a CSR matrix restricted to the kept rows and columns, renumbered by remap, as lists.
+        """
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        kept = keep[rows] & keep[indices]
+        rows, columns = remap[rows[kept]], remap[indices[kept]]
+        bounds = np.cumsum(np.bincount(rows, minlength=size))[:-1]
+        return [row.tolist() for row in np.split(columns, bounds)] if size else []
+
+    def argument(self, argument_id):
+        if not self.is_active(argument_id):
+            raise KeyError(argument_id)
+        return self.base.argument(argument_id)
 
+    def remove_arguments(self, argument_ids):
+        for argument_id in argument_ids:
+            bit = self.index.get(argument_id)
+            if bit is not None:
+                self.active &= ~(1 << bit)
+
+    def arguments_that_attack(self, argument):
+        if isinstance(argument, list):
+            return self.arguments_that_attack_list(argument)
+        if not self.is_active(argument):
+            return set()
+        if isinstance(self.base, FrozenArgumentationFramework):
+            return set(self.base.ids_of(self.base.attacked_by_masks[self.index[argument]] & self.active))
+        return {arg_id for arg_id in self.base.arguments_that_attack(argument) if self.is_active(arg_id)}
 
+    def arguments_attacked_by(self, argument):
+        if isinstance(argument, list):
+            return self.arguments_attacked_by_list(argument)
+        if not self.is_active(argument):
+            return set()
+        if isinstance(self.base, FrozenArgumentationFramework):
+            return set(self.base.ids_of(self.base.attacks_masks[self.index[argument]] & self.active))
+        return {arg_id for arg_id in self.base.arguments_attacked_by(argument) if self.is_active(arg_id)}
 
 
+class FrozenArgumentationFramework(ArgumentationFramework):
+    """
+    An immutable, array-backed snapshot of an ArgumentationFramework.
+    Arguments are remapped to dense indices 0..n-1 (in argument_ids() order). Attacks are stored as CSR arrays
+    and as one bitmask (Python int) per argument, so unions over sets of arguments are bitwise ORs.
+    """
+    def __init__(self, framework):
+        ids = list(framework.argument_ids())
+        index = {arg_id: i for i, arg_id in enumerate(ids)}
+        sources, targets = [], []
+        for i, arg_id in enumerate(ids):
+            attacked = [index[b] for b in framework.arguments_attacked_by(arg_id) if b in index]
+            sources.extend([i] * len(attacked))
+            targets.extend(attacked)
+        self.set_arrays(ids, [framework.argument(arg_id) for arg_id in ids], sources, targets,
+                        framework.argument_strength)
+
+    @classmethod
+    def from_dense(cls, ids, argument_objs, sources, targets, argument_strength=None):
+        """
+        Builds a frozen framework straight from attack arrays, without an intermediate mutable framework.
+        :param ids: Argument ids, in dense index order.
+        :param argument_objs: Argument objects, in the same order.
+        :param sources: Dense index of the attacker of each attack.
+        :param targets: Dense index of the attacked argument of each attack. Repeated attacks are merged.
+        :return: A new FrozenArgumentationFramework.
+        """
+        framework = cls.__new__(cls)
+        framework.set_arrays(ids, argument_objs, sources, targets, argument_strength if argument_strength else {})
+        return framework
+
+    def set_arrays(self, ids, argument_objs, sources, targets, argument_strength):
+        n = len(ids)
+        self.ids = list(ids)
+        self.index = {arg_id: i for i, arg_id in enumerate(self.ids)}
+        self.argument_objs = list(argument_objs)
+        # Sorting the attacks as (source, target) pairs gives the CSR layout, (target, source) pairs its transpose.
+        attacks = np.sort(np.asarray(sources, dtype=np.int64) * n + np.asarray(targets, dtype=np.int64))
+        attacks = attacks[np.concatenate(([True], attacks[1:] != attacks[:-1]))] if len(attacks) else attacks
+        sources, targets = attacks // n, attacks % n
+        by_target = np.lexsort((sources, targets))
+        out_degrees = np.bincount(sources, minlength=n)
+        in_degrees = np.bincount(targets, minlength=n)
+        self.attacks_indptr = np.concatenate(([0], np.cumsum(out_degrees))).astype(np.int64)
+        self.attacks_indices = targets.astype(np.int32)
+        self.attacked_by_indptr = np.concatenate(([0], np.cumsum(in_degrees))).astype(np.int64)
+        self.attacked_by_indices = sources[by_target].astype(np.int32)
+        self.attacks_masks = self.to_masks(self.attacks_indptr, self.attacks_indices, n)
+        self.attacked_by_masks = self.to_masks(self.attacked_by_indptr, self.attacked_by_indices, n)
+        self.__dense_graph = None
+        self.argument_strength = dict(argument_strength)
+        # Ranking keys per dense index. Ties are broken by argument order, as in the mutable framework.
+        self.least_attacked_ranks = list(zip(in_degrees.tolist(), range(n)))
+        self.strongest_attacker_ranks = list(zip((-out_degrees).tolist(), range(n)))
+        self.least_attacked = sorted(self.ids, key=self.least_attacked_rank)
+        self.strongest_attackers = sorted(self.ids, key=self.strongest_attacker_rank)
+
+    @staticmethod
+    def to_masks(indptr, indices, size):
+        """
+        :return: One bitmask per CSR row, with the row's column indices set.
+        """
+        num_bytes = (size + 7) // 8
+        masks = []
+        for start, end in zip(indptr[:-1].tolist(), indptr[1:].tolist()):
+            if start == end:
+                masks.append(0)
+                continue
+            row = indices[start:end]
+            packed = np.zeros(num_bytes, dtype=np.uint8)
+            np.bitwise_or.at(packed, row >> 3, (1 << (row & 7)).astype(np.uint8))
+            masks.append(int.from_bytes(packed.tobytes(), "little"))
+        return masks
+
+    def without(self, argument_ids):
+        """
+        Unlike remove_arguments, leaves this framework untouched. Argument objects are shared, not copied.
+        :param argument_ids: Ids of the arguments to leave out. Unknown ids are ignored.
+        :return: A new framework of the same class without the given arguments and their attacks.
+        """
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[[self.index[arg_id] for arg_id in argument_ids if arg_id in self.index]] = False
+        kept = np.flatnonzero(keep).tolist()
+        remap = np.cumsum(keep) - 1
+        sources = np.repeat(np.arange(len(self.ids)), np.diff(self.attacks_indptr))
+        targets = self.attacks_indices
+        kept_attacks = keep[sources] & keep[targets]
+        return type(self).from_dense([self.ids[i] for i in kept], [self.argument_objs[i] for i in kept],
+                                     remap[sources[kept_attacks]], remap[targets[kept_attacks]], self.argument_strength)
+
+    def least_attacked_rank(self, argument_id):
+        return self.least_attacked_ranks[self.index[argument_id]]
+
+    def strongest_attacker_rank(self, argument_id):
+        return self.strongest_attacker_ranks[self.index[argument_id]]
+
+    def rank_least_attacked_arguments(self):
+        pass
+
+    def rank_strongest_attacker_arguments(self):
+        pass
+
+    def mask(self, argument_ids):
+        """
+        :return: Bitmask with the dense indices of the given argument ids set.
+        """
+        mask = 0
+        for argument_id in argument_ids:
+            mask |= 1 << self.index[argument_id]
+        return mask
+
+    @staticmethod
+    def mask_to_array(mask, size):
+        """
+        :param mask: Bitmask with bits below size only.
+        :return: Boolean array of length size, True where the mask bit is set.
+        """
+        packed = np.frombuffer(mask.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+        return np.unpackbits(packed, count=size, bitorder="little").astype(bool)
+
+    def ids_of(self, mask):
+        """
+        The inverse of mask.
+        :return: List of argument ids whose dense indices are set, in ascending index order.
+        """
+        if not mask:
+            return []
+        return [self.ids[i] for i in np.flatnonzero(self.mask_to_array(mask, len(self.ids))).tolist()]
+
+    def attackers_mask_of(self, argument_ids):
+        """
+        :return: Bitmask of all arguments that attack any of the given arguments.
+        """
+        mask = 0
+        for argument_id in argument_ids:
+            mask |= self.attacked_by_masks[self.index[argument_id]]
+        return mask
 
+    def attacks_mask_of(self, argument_ids):
+        """
+        :return: Bitmask of all arguments attacked by any of the given arguments.
+        """
+        mask = 0
+        for argument_id in argument_ids:
+            mask |= self.attacks_masks[self.index[argument_id]]
+        return mask
+
+    def dense_graph(self):
+        """
+        :return: Tuple (ids, index, attackers, attacked) as expected by native_solver.
+        """
+        if self.__dense_graph is None:
+            attacked = [self.attacks_indices[self.attacks_indptr[i]:self.attacks_indptr[i + 1]].tolist()
+                        for i in range(len(self.ids))]
+            attackers = [self.attacked_by_indices[self.attacked_by_indptr[i]:self.attacked_by_indptr[i + 1]].tolist()
+                         for i in range(len(self.ids))]
+            self.__dense_graph = (self.ids, self.index, attackers, attacked)
+        return self.__dense_graph
+
+    @property
+    def all_arguments(self):
+        return dict(zip(self.ids, self.argument_objs))
+
+    @property
+    def all_attacks(self):
+        return {arg_id: set(self.ids_of(mask)) for arg_id, mask in zip(self.ids, self.attacks_masks) if mask}
+
+    @property
+    def all_attacked_by(self):
+        return {arg_id: set(self.ids_of(mask)) for arg_id, mask in zip(self.ids, self.attacked_by_masks) if mask}
+
+    def arguments(self):
+        return self.argument_objs
+
+    def argument_ids(self):
+        return self.ids
+
+    def attacks(self):
+        return self.all_attacks
+
+    def attacked_by(self):
+        return self.all_attacked_by
+
+    def argument(self, argument_id):
+        return self.argument_objs[self.index[argument_id]]
+
+    def freeze(self):
+        return self
+
+    def remove_argument(self, argument_id):
+        raise TypeError("FrozenArgumentationFramework is immutable")
+
+    def remove_arguments(self, argument_ids):
+        raise TypeError("FrozenArgumentationFramework is immutable")
+
+    def add_argument(self, argument):
+        raise TypeError("FrozenArgumentationFramework is immutable")
+
+    def add_attack(self, attacker_id, attacked_id):
+        raise TypeError("FrozenArgumentationFramework is immutable")
+
+    def add_attacks(self, attacker_ids, attacked_ids):
+        raise TypeError("FrozenArgumentationFramework is immutable")
+
+    def arguments_that_attack(self, argument):
+        if isinstance(argument, list):
+            return self.arguments_that_attack_list(argument)
+        if argument not in self.index:
+            return set()
+        return set(self.ids_of(self.attacked_by_masks[self.index[argument]]))
+
+    def arguments_that_attack_list(self, argument_list):
+        return set(self.ids_of(self.attackers_mask_of(arg_id for arg_id in argument_list if arg_id in self.index)))
+
+    def arguments_attacked_by(self, argument):
+        if isinstance(argument, list):
+            return self.arguments_attacked_by_list(argument)
+        if argument not in self.index:
+            return set()
+        return set(self.ids_of(self.attacks_masks[self.index[argument]]))
+
+    def arguments_attacked_by_list(self, argument_list):
+        return set(self.ids_of(self.attacks_mask_of(arg_id for arg_id in argument_list if arg_id in self.index)))
@@ -1,13 +1,278 @@
-from argument import ArgumentationFramework
+import numpy as np
+
+from argument import ArgumentationFramework, DerivedArgumentationFramework, FrozenArgumentationFramework
+from argument import PrivateArgument
+
+# (k, l) offsets of the attacks 4x + k -> 4x + l between the nodes of one argument x:
+# contradictory hypotheses, contradictory verified arguments, and verified arguments against hypotheses.
+INTERNAL_ATTACKS = [(0, 1), (1, 0), (2, 3), (3, 2), (2, 1), (3, 0)]
+# (k, l) offsets of the attacks 4x + k -> 4y + l for every attack x -> y of the culture.
+# Each hypothesis attacks both the attacked hypothesis and verified arguments of the other colour.
+CROSS_ATTACKS = [(0, 1), (0, 3), (1, 0), (1, 2)]
+
+
+# Colours and kinds of alteroceptive nodes: node 4x + k has colour k % 2 and kind k // 2.
+BLACK, WHITE = 0, 1
+HYPOTHESIS, VERIFIED = 0, 1
+
+
+def always_true(*args, **kwargs):
+    # To be used as a function pointer.
+    return True
+
+
+def alteroceptive_node(argument, k):
+    """
+    :param argument: An argument x of the culture.
+    :param k: 0 (black hypothesis), 1 (white hypothesis), 2 (black verified) or 3 (white verified).
+    :return: The PrivateArgument 4x + k of the alteroceptive framework.
+    """
+    if k < 2:
+        text = argument.hypothesis_text
+        verifier = argument.hypothesis_verifier if argument.hypothesis_verifier else always_true
+    else:
+        text = argument.verified_fact_text
+        verifier = argument.fact_verifier if argument.fact_verifier else argument.verifier()
+    node = PrivateArgument(arg_id=argument.id() * 4 + k, descriptive_text=text, privacy_cost=argument.privacy_cost)
+    node.set_verifier(verifier)
+    return node
+
+
+class FrozenAlteroceptiveFramework(FrozenArgumentationFramework):
+    """
+    A frozen alteroceptive framework. On top of the frozen arrays, the attackers of every node are kept split by
+    colour and kind (4 groups, see BLACK/WHITE and HYPOTHESIS/VERIFIED), each sorted by privacy cost, so a player's
+    candidate moves are fetched without filtering by parity.
+    Node ids (4x + k) are sparse, more so once pruned. id_array and dense_index map them to dense indices 0..n-1 and
+    back, and privacy costs, colours, degrees and ranking positions are kept as arrays over those indices, so the
+    dialogue can work on dense indices and convert to ids only at the API boundary.
+    """
+    def set_arrays(self, ids, argument_objs, sources, targets, argument_strength):
+        super().set_arrays(ids, argument_objs, sources, targets, argument_strength)
+        n = len(self.ids)
+        self.id_array = np.asarray(self.ids, dtype=np.int64)
+        # dense_index[arg_id] is the dense index of arg_id, or -1 for ids not in this framework.
+        self.dense_index = np.full(int(self.id_array.max()) + 1 if n else 0, -1, dtype=np.int64)
+        self.dense_index[self.id_array] = np.arange(n)
+        self.privacy_costs = np.array([argument.privacy_cost for argument in self.argument_objs], dtype=float)
+        self.black = self.id_array % 2 == BLACK
+        self.in_degrees = np.diff(self.attacked_by_indptr)
+        self.out_degrees = np.diff(self.attacks_indptr)
+        # Position of each dense index in least_attacked and strongest_attackers.
+        self.least_attacked_positions = self.positions(np.lexsort((np.arange(n), self.in_degrees)))
+        self.strongest_attacker_positions = self.positions(np.lexsort((np.arange(n), -self.out_degrees)))
+        groups = self.id_array % 4
+        costs = self.privacy_costs
+        # Position of each dense index when sorted by privacy cost, ties in framework order.
+        self.cost_ranks = np.argsort(np.argsort(costs, kind="stable"), kind="stable").tolist()
+        attacked = np.repeat(np.arange(n), np.diff(self.attacked_by_indptr))
+        attackers = self.attacked_by_indices.astype(np.int64)
+        # Segment 4i + g lists the attackers of dense index i in group g.
+        segments = 4 * attacked + groups[attackers]
+        order = np.lexsort((attackers, costs[attackers], segments))
+        self.grouped_attackers_indptr = np.concatenate(([0], np.cumsum(np.bincount(segments, minlength=4 * n))))
+        self.grouped_attackers_indices = attackers[order].astype(np.int32)
+
+    @staticmethod
+    def positions(order):
+        """
+        :return: The inverse permutation of order: positions[order[k]] == k.
+        """
+        positions = np.empty(len(order), dtype=np.int64)
+        positions[order] = np.arange(len(order))
+        return positions
+
+    def indices_of(self, argument_ids):
+        """
+        :return: Array of dense indices of the given argument ids, -1 for ids not in this framework.
+        """
+        argument_ids = np.asarray(argument_ids, dtype=np.int64)
+        known = (argument_ids >= 0) & (argument_ids < len(self.dense_index))
+        return np.where(known, self.dense_index[np.where(known, argument_ids, 0)], -1)
+
+    def ids_at(self, indices):
+        """
+        The inverse of indices_of.
+        :return: List of argument ids at the given dense indices.
+        """
+        return [self.ids[i] for i in np.asarray(indices, dtype=np.int64).tolist()]
+
+    def attacker_indices_by_cost(self, argument_ids, colour, kinds=(HYPOTHESIS, VERIFIED), exclude=0):
+        """
+        :param argument_ids: Ids of the attacked arguments.
+        :param colour: BLACK or WHITE, the colour of the attackers.
+        :param kinds: Kinds of the attackers, HYPOTHESIS and/or VERIFIED.
+        :param exclude: Bitmask of arguments to leave out (see mask).
+        :return: Array of dense indices of the attackers, cheapest first. Ties are in framework order.
+        """
+        indptr = self.grouped_attackers_indptr
+        segments = [4 * self.index[arg_id] + 2 * kind + colour for arg_id in argument_ids for kind in kinds]
+        attackers = [i for segment in segments
+                     for i in self.grouped_attackers_indices[indptr[segment]:indptr[segment + 1]].tolist()]
+        if len(segments) > 1:
+            attackers = sorted(set(attackers), key=self.cost_ranks.__getitem__)
+        return np.array([i for i in attackers if not (exclude >> i) & 1], dtype=np.int64)
+
+    def attackers_by_cost(self, argument_ids, colour, kinds=(HYPOTHESIS, VERIFIED), exclude=0):
+        """
+        Same as attacker_indices_by_cost, returning a list of ids.
+        """
+        return self.ids_at(self.attacker_indices_by_cost(argument_ids, colour, kinds, exclude))
+
+    def verify_indices(self, indices, me, they):
+        """
+        :param indices: Dense indices of the arguments to verify.
+        :return: Boolean array, True where the argument holds for me against they.
+        """
+        return np.fromiter((bool(self.argument_objs[i].verify(me, they)) for i in indices.tolist()),
+                           dtype=bool, count=len(indices))
+
+    def verification_results(self, defender, challenger):
+        """
+        Verifies every node for a dialogue between two agents. Black nodes are verified for the defender against the
+        challenger, white nodes the other way around.
+        :return: Boolean array over dense indices, True where the node is verified.
+        """
+        return np.fromiter((bool(argument.verify(defender, challenger) if black
+                                 else argument.verify(challenger, defender))
+                            for argument, black in zip(self.argument_objs, self.black.tolist())),
+                           dtype=bool, count=len(self.ids))
+
+
+class AlteroceptiveFramework(DerivedArgumentationFramework):
+    """
+    The alteroceptive (black-and-white) framework of a culture, derived on demand from the culture's framework.
+    Nothing of size 4n is stored up front: node ids and attacks are translated from the base framework whenever
+    they are asked for, and node arguments are built the first time they are asked for. Use freeze to materialise it.
+    The base framework must not be modified while this framework is in use.
+    """
+    def __init__(self, base, removed=(), position=None, nodes=None):
+        """
+        :param base: The culture's (mutable) ArgumentationFramework.
+        :param removed: Node ids left out of this framework.
+        :param position: Mapping from base argument id to its position in base.argument_ids(), shared between
+        frameworks derived from the same base.
+        :param nodes: Cache of node arguments by node id, shared between frameworks derived from the same base.
+        """
+        self.base = base
+        self.removed = set(removed)
+        self.position = position if position is not None else \
+            {arg_id: i for i, arg_id in enumerate(base.argument_ids())}
+        self.nodes = nodes if nodes is not None else {}
+        self.argument_strength = {}
+        self.least_attacked = []
+        self.strongest_attackers = []
+
+    def is_active(self, argument_id):
+        return argument_id // 4 in self.position and argument_id not in self.removed
+
+    def without(self, argument_ids):
+        """
+        :param argument_ids: Node ids to be left out.
+        :return: A new framework over the same base, without the given nodes.
+        """
+        return AlteroceptiveFramework(self.base, self.removed.union(argument_ids), self.position, self.nodes)
+
+    def rank_key(self, argument_id):
+        return 4 * self.position[argument_id // 4] + argument_id % 4
+
+    def argument_ids(self):
+        return [arg_id * 4 + k for arg_id in self.base.argument_ids() for k in range(4)
+                if arg_id * 4 + k not in self.removed]
+
+    def argument(self, argument_id):
+        if not self.is_active(argument_id):
+            raise KeyError(argument_id)
+        return self.node(argument_id)
+
+    def node(self, argument_id):
+        """
+        :return: The node argument argument_id, built on first use.
+        """
+        node = self.nodes.get(argument_id)
+        if node is None:
+            node = alteroceptive_node(self.base.argument(argument_id // 4), argument_id % 4)
+            self.nodes[argument_id] = node
+        return node
+
+    def privacy_cost(self, argument_id):
+        if not self.is_active(argument_id):
+            raise KeyError(argument_id)
+        return self.base.argument(argument_id // 4).privacy_cost
+
+    def remove_arguments(self, argument_ids):
+        self.removed.update(argument_ids)
+
+    def arguments_that_attack(self, argument):
+        if isinstance(argument, list):
+            return self.arguments_that_attack_list(argument)
+        if not self.is_active(argument):
+            return set()
+        arg_id, k = divmod(argument, 4)
+        attackers = {arg_id * 4 + source for source, target in INTERNAL_ATTACKS if target == k}
+        sources = [source for source, target in CROSS_ATTACKS if target == k]
+        for attacker_id in self.base.arguments_that_attack(arg_id):
+            attackers.update(attacker_id * 4 + source for source in sources)
+        return {node for node in attackers if node // 4 in self.position and node not in self.removed}
+
+    def arguments_attacked_by(self, argument):
+        if isinstance(argument, list):
+            return self.arguments_attacked_by_list(argument)
+        if not self.is_active(argument):
+            return set()
+        arg_id, k = divmod(argument, 4)
+        attacked = {arg_id * 4 + target for source, target in INTERNAL_ATTACKS if source == k}
+        targets = [target for source, target in CROSS_ATTACKS if source == k]
+        if targets:
+            for attacked_id in self.base.arguments_attacked_by(arg_id):
+                attacked.update(attacked_id * 4 + target for target in targets)
+        return {node for node in attacked if node // 4 in self.position and node not in self.removed}
+
+    def freeze(self):
+        """
+        Materialises this framework. Attacks are computed as arrays over dense indices: argument i of the base
+        becomes nodes 4i..4i + 3, in the same order as argument_ids, before removed nodes are dropped. Only the
+        nodes that are kept are built.
+        :return: A FrozenAlteroceptiveFramework.
+        """
+        graph = self.base.to_sparse()
+        base = 4 * np.arange(len(graph.ids), dtype=np.int64)
+        attacks = graph.matrix.tocoo()
+        attackers, attacked = 4 * attacks.row.astype(np.int64), 4 * attacks.col.astype(np.int64)
+        sources = np.concatenate([base + k for k, _ in INTERNAL_ATTACKS] + [attackers + k for k, _ in CROSS_ATTACKS])
+        targets = np.concatenate([base + l for _, l in INTERNAL_ATTACKS] + [attacked + l for _, l in CROSS_ATTACKS])
+        node_ids = (4 * np.asarray(graph.ids, dtype=np.int64)[:, None] + np.arange(4)).ravel()
+        keep = ~np.isin(node_ids, np.fromiter(self.removed, dtype=np.int64, count=len(self.removed)))
+        remap = np.cumsum(keep) - 1
+        kept_attacks = keep[sources] & keep[targets]
+        ids = node_ids[keep].tolist()
+        return FrozenAlteroceptiveFramework.from_dense(ids, [self.node(node_id) for node_id in ids],
+                                                       remap[sources[kept_attacks]], remap[targets[kept_attacks]])
+
 
 class Culture:
     """
     Base Culture virtual interface. Meant to be extended with your own culture.
     """
+    # Keep raw_alteroceptive_framework as an AlteroceptiveFramework derived on demand from AF, instead of
+    # materialising it. Saves memory (and deep copy time) on very large cultures, and the pruned framework of
+    # AgentQueue.create_alteroceptive_framework is then frozen without building the pruned nodes.
+    lazy_alteroceptive_framework = True
+
     def __init__(self):
         self.AF = ArgumentationFramework()
         self.properties = {}
         self.name = None
+        self.raw_alteroceptive_framework = None
+        # Frozen, pruned alteroceptive frameworks by the frozenset of node ids left out.
+        # See frozen_alteroceptive_framework.
+        self.frozen_alteroceptive_frameworks = {}
+
+    def __getstate__(self):
+        # Copies of a culture rebuild their frozen frameworks on demand instead of copying them.
+        state = self.__dict__.copy()
+        state["frozen_alteroceptive_frameworks"] = {}
+        return state
 
     def create_arguments(self):
         pass
@@ -20,3 +285,34 @@ class Culture:
 
     def arguments_attacked_by_list(self, argument_list):
         return self.AF.arguments_attacked_by_list(argument_list)
+
+    def generate_alteroceptive_framework(self):
+        """
+        This function generates and populates an alteroceptive framework (forced bipartition) from an existing culture.
+        An alteroceptive framework is built with the following rules:
+        1. Every argument is represented by 4 nodes, black and white X hypothesis and verified.
+        2. Every attack between arguments is reconstructed between nodes of different colours.
+        Node x of the culture becomes ids 4x (black hypothesis), 4x + 1 (white hypothesis), 4x + 2 (black verified)
+        and 4x + 3 (white verified).
+        :return: A frozen black-and-white framework, or an AlteroceptiveFramework if lazy_alteroceptive_framework.
+        """
+        alteroceptive_framework = AlteroceptiveFramework(self.AF)
+        if not self.lazy_alteroceptive_framework:
+            alteroceptive_framework = alteroceptive_framework.freeze()
+        self.raw_alteroceptive_framework = alteroceptive_framework
+        self.frozen_alteroceptive_frameworks = {}
+        return self.raw_alteroceptive_framework
+
+    def frozen_alteroceptive_framework(self, removed=()):
+        """
+        Freezes the alteroceptive framework without the given nodes, once per set of nodes: later calls return the
+        same (immutable) framework.
+        :param removed: Node ids left out.
+        :return: A FrozenAlteroceptiveFramework.
+        """
+        removed = frozenset(removed)
+        frozen = self.frozen_alteroceptive_frameworks.get(removed)
+        if frozen is None:
+            frozen = self.raw_alteroceptive_framework.without(removed).freeze()
+            self.frozen_alteroceptive_frameworks[removed] = frozen
+        return frozen
@@ -1,6 +1,6 @@
 from enum import IntEnum, auto
 from base_culture import Culture
-from argument import Argument, PrivateArgument, ArgumentationFramework
+from argument import Argument, PrivateArgument
 from boat_agent import BoatAgent
 import random
 
@@ -103,11 +103,6 @@ class SuperVIP(IntEnum):
     HeadOfState = auto()
 
 
-def always_true(*args, **kwargs):
-    # To be used as a function pointer.
-    return True
-
-
 class BoatCulture(Culture):
     """
     A practical instantiation of a Culture, using rules created for a Boat scenario.
@@ -118,7 +113,6 @@ class BoatCulture(Culture):
         self.ids = {}
         super().__init__()
         self.name = "Boat Culture"
-        self.raw_alteroceptive_framework = None
 
         self.properties = {"BoatCategory": BoatCategory.Civilian,
                            "TaskedStatus": TaskedStatus.Returning,
@@ -136,7 +130,6 @@ class BoatCulture(Culture):
 
         self.create_arguments()
         self.define_attacks()
-        # FIXME: Both this call and the RandomCulture one must be merged.
         self.generate_alteroceptive_framework()
 
     def create_arguments(self):
@@ -628,67 +621,3 @@ class BoatCulture(Culture):
 
         # Attacks to has_emergency.
         attack(ID["super_vip"], ID["has_emergency"])
-
-    def generate_alteroceptive_framework(self):
-        """
-        This function generates and populates an alteroceptive framework (forced bipartition) from an existing culture.
-        An alteroceptive framework is built with the following rules:
-        1. Every argument is represented by 4 nodes, black and white X hypothesis and verified.
-        2. Every attack between arguments is reconstructed between nodes of different colours.
-        :return: A flat black-and-white framework.
-        """
-        self.raw_alteroceptive_framework = ArgumentationFramework()
-        for argument in self.AF.arguments():
-            # Even indices for defender, odd for challenger.
-            # Adding hypothetical arguments.
-            black_hypothesis = PrivateArgument(arg_id=argument.id() * 4,
-                                               descriptive_text=argument.hypothesis_text,
-                                               privacy_cost=argument.privacy_cost)
-            white_hypothesis = PrivateArgument(arg_id=argument.id() * 4 + 1,
-                                               descriptive_text=argument.hypothesis_text,
-                                               privacy_cost=argument.privacy_cost)
-            h_verifier = argument.hypothesis_verifier if argument.hypothesis_verifier else always_true
-            black_hypothesis.set_verifier(h_verifier)
-            white_hypothesis.set_verifier(h_verifier)
-
-            # Adding verified arguments.
-            black_verified = PrivateArgument(arg_id=argument.id() * 4 + 2,
-                                             descriptive_text=argument.verified_fact_text,
-                                             privacy_cost=argument.privacy_cost)
-            white_verified = PrivateArgument(arg_id=argument.id() * 4 + 3,
-                                             descriptive_text=argument.verified_fact_text,
-                                             privacy_cost=argument.privacy_cost)
-            f_verifier = argument.fact_verifier if argument.fact_verifier else argument.verifier()
-            black_verified.set_verifier(f_verifier)
-            white_verified.set_verifier(f_verifier)
-
-            self.raw_alteroceptive_framework.add_arguments([black_hypothesis, white_hypothesis, black_verified, white_verified])
-
-            # Adding mutual attacks between contradictory hypotheses.
-            self.raw_alteroceptive_framework.add_attack(black_hypothesis.id(), white_hypothesis.id())
-            self.raw_alteroceptive_framework.add_attack(white_hypothesis.id(), black_hypothesis.id())
-
-            # Adding mutual attacks between contradictory verified arguments.
-            self.raw_alteroceptive_framework.add_attack(black_verified.id(), white_verified.id())
-            self.raw_alteroceptive_framework.add_attack(white_verified.id(), black_verified.id())
-
-            # Adding attacks between immediate verified and hypothetical arguments.
-            self.raw_alteroceptive_framework.add_attack(black_verified.id(), white_hypothesis.id())
-            self.raw_alteroceptive_framework.add_attack(white_verified.id(), black_hypothesis.id())
-
-        # Adding attacks between different arguments in original framework.
-        # Each hypothesis attacks both the attacked hypothesis and verified arguments.
-        for attacker_id, attacked_set in self.AF.attacks().items():
-            black_hypothesis_attacker_id = attacker_id * 4
-            white_hypothesis_attacker_id = attacker_id * 4 + 1
-
-            # Reproducing previous attacks, crossing between black and white nodes.
-            for attacked_id in attacked_set:
-                black_hypothesis_attacked_id = attacked_id * 4
-                white_hypothesis_attacked_id = attacked_id * 4 + 1
-                black_verified_attacked_id = attacked_id * 4 + 2
-                white_verified_attacked_id = attacked_id * 4 + 3
-                self.raw_alteroceptive_framework.add_attack(black_hypothesis_attacker_id, white_hypothesis_attacked_id)
-                self.raw_alteroceptive_framework.add_attack(black_hypothesis_attacker_id, white_verified_attacked_id)
-                self.raw_alteroceptive_framework.add_attack(white_hypothesis_attacker_id, black_hypothesis_attacked_id)
-                self.raw_alteroceptive_framework.add_attack(white_hypothesis_attacker_id, black_verified_attacked_id)
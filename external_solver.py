@@ -0,0 +1,53 @@
+"""
+Invocation of external ICCMA-style solvers (e.g. mu-toksia) without shared files.
+The framework is piped through the solver's stdin where the platform allows it, or otherwise written to a
+private temporary directory created for the call, so concurrent calls never see each other's input.
+"""
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+
+# Command line of mu-toksia: the MU_TOKSIA environment variable if set, else a mu-toksia on the PATH, else the
+# bundled binary.
+if os.environ.get("MU_TOKSIA"):
+    MU_TOKSIA = shlex.split(os.environ["MU_TOKSIA"])
+elif shutil.which("mu-toksia"):
+    MU_TOKSIA = ["mu-toksia"]
+else:
+    MU_TOKSIA = [os.path.join("mu-toksia", "mu-toksia.exe")]
+
+
+def available(command=None):
+    """
+    :return: Whether the solver command (mu-toksia by default) can be executed.
+    """
+    return shutil.which((command if command else MU_TOKSIA)[0]) is not None
+
+
+def run(aspartix_text, semantics, arg_str="", command=None):
+    """
+    Runs an external solver on a framework in ASPARTIX format.
+    :param aspartix_text: The framework, as produced by to_aspartix_id.
+    :param semantics: The type of semantics to be considered.
+    :param arg_str: The string defining the argument.
+    :param command: Solver command line. Defaults to mu-toksia.
+    :return: stdout output of the solver.
+    """
+    args = list(command if command else MU_TOKSIA) + ["-p", semantics, "-fo", "apx"]
+    query = ["-a", arg_str] if arg_str else []
+    if os.name == "posix":
+        result = subprocess.run(args + ["-f", "/dev/stdin"] + query, input=aspartix_text,
+                                capture_output=True, text=True)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "framework.apx")
+            with open(filename, 'w') as file:
+                file.write(aspartix_text)
+            result = subprocess.run(args + ["-f", filename] + query, capture_output=True, text=True)
+
+    if result.stderr:  # some error
+        raise RuntimeError('Failed to compute extension: {}'.format(result.stderr))
+
+    return result.stdout
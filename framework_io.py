@@ -0,0 +1,81 @@
+"""
+Reading and writing argumentation frameworks.
+The ASPARTIX (.apx) writer and reader work line by line, so they scale linearly with the number of attacks.
+The binary format is a directory of NumPy .npy files holding the argument ids, their privacy costs and the
+attacks as parallel source/target arrays. Unlike .npz archives, .npy files can be memory-mapped, so they are
+only read as they are used.
+"""
+import os
+import re
+
+import numpy as np
+
+import native_solver
+
+ASPARTIX_PATTERN = re.compile(r"(arg|att)\(\s*([^,()\s]+)\s*(?:,\s*([^,()\s]+)\s*)?\)")
+
+
+def aspartix_lines(framework, descriptive=False):
+    """
+    Generator over the lines of the ASPARTIX representation of a framework.
+    :param descriptive: Use the descriptive text of the arguments instead of their ids.
+    """
+    if descriptive:
+        name = lambda argument_id: framework.argument(argument_id).descriptive_text
+    else:
+        name = lambda argument_id: argument_id
+    for argument_id in framework.argument_ids():
+        yield "arg({}).\n".format(name(argument_id))
+    for attacker_id, attacked_set in framework.attacks().items():
+        attacker_name = name(attacker_id)
+        for attacked_id in attacked_set:
+            yield "att({},{}).\n".format(attacker_name, name(attacked_id))
+
+
+def write_aspartix(framework, file, descriptive=False):
+    """
+    Streams the ASPARTIX representation of a framework to an open text file.
+    """
+    file.writelines(aspartix_lines(framework, descriptive))
+
+
+def read_aspartix(file, id_type=int):
+    """
+    Generator over the arguments and attacks of an ASPARTIX file, parsed line by line as the file is read.
+    :param file: An open text file, or any iterable of lines.
+    :param id_type: Conversion applied to every argument name.
+    :return: Yields ("arg", id) and ("att", attacker, attacked) tuples, in file order.
+    """
+    for line in file:
+        for kind, first, second in ASPARTIX_PATTERN.findall(line):
+            if kind == "arg":
+                yield kind, id_type(first)
+            elif second:
+                yield kind, id_type(first), id_type(second)
+
+
+BINARY_ARRAYS = ("ids", "costs", "sources", "targets")
+
+
+def save_binary(framework, dirname):
+    """
+    Saves a framework's ids, privacy costs and attacks as NumPy arrays, one .npy file each in dirname.
+    Arguments without a privacy cost are stored with cost 0.
+    """
+    ids, _, _, attacked = native_solver.dense_graph(framework)
+    ids = np.asarray(ids, dtype=np.int64)
+    sources = np.repeat(ids, [len(targets) for targets in attacked])
+    targets = ids[np.fromiter((j for targets in attacked for j in targets), dtype=np.int64, count=len(sources))]
+    costs = np.array([getattr(framework.argument(arg_id), "privacy_cost", 0) for arg_id in ids.tolist()])
+    os.makedirs(dirname, exist_ok=True)
+    for name, array in zip(BINARY_ARRAYS, (ids, costs, sources, targets)):
+        np.save(os.path.join(dirname, name + ".npy"), array)
+
+
+def load_binary(dirname, mmap_mode="r"):
+    """
+    :param mmap_mode: Passed to np.load. The default maps the files read-only instead of reading them; None reads
+    them into memory.
+    :return: Tuple (ids, costs, sources, targets) of NumPy arrays, as written by save_binary.
+    """
+    return tuple(np.load(os.path.join(dirname, name + ".npy"), mmap_mode=mmap_mode) for name in BINARY_ARRAYS)
@@ -0,0 +1,959 @@
+"""
+In-process solver for acceptance problems on Dung-style argumentation frameworks.
+Answers the same queries as mu-toksia without writing the framework to disk or spawning a process.
+Problem names follow the ICCMA convention (e.g. "DS-PR": skeptical acceptance under preferred semantics).
+"""
+import math
+import random
+import re
+import statistics
+
+import numpy as np
+from scipy.sparse import csr_array
+
+# Argument labels used during the search for extensions.
+BLANK = 0
+IN = 1
+OUT = 2
+MUST_OUT = 3
+UNDEC = 4
+
+SUPPORTED_PROBLEMS = {"DS-PR", "DC-PR", "DS-GR", "DC-GR", "DS-CO", "DC-CO", "EE-PR", "EE-GR", "EE-CO"}
+
+EXTENSION_PATTERN = re.compile(r"\[([^\[\]]*)\]")
+
+# How many problems were settled by the grounded labelling alone ("taken") or needed a full solver ("fallback").
+# Counts are per process: SolverPool adds the counts of its workers to the parent's.
+fast_path_counts = {"taken": 0, "fallback": 0}
+
+
+def reset_fast_path_counts():
+    """
+    Zeroes fast_path_counts, e.g. at the start of a run.
+    """
+    for key in fast_path_counts:
+        fast_path_counts[key] = 0
+
+
+def add_fast_path_counts(counts):
+    """
+    Adds counts collected elsewhere (e.g. in a worker process) to fast_path_counts.
+    """
+    for key, count in counts.items():
+        fast_path_counts[key] += count
+
+
+def supports(semantics):
+    return semantics in SUPPORTED_PROBLEMS
+
+
+def dense_graph(framework):
+    """
+    Remaps the (sparse) argument ids of a framework to indices 0..n-1.
+    Attacks involving ids that are not arguments of the framework are ignored.
+    :param framework: Any object exposing argument_ids, arguments_that_attack and arguments_attacked_by.
+    :return: Tuple (ids, index, attackers, attacked), where attackers[i] and attacked[i] are lists of indices.
+    """
+    if hasattr(framework, "dense_graph"):
+        # Frozen frameworks (and views of them) keep their dense form around.
+        return framework.dense_graph()
+    return adjacency_lists(framework)
+
+
+def adjacency_lists(framework):
+    """
+    The generic path of dense_graph: asks the framework for the attackers and attacked arguments of each argument.
+    :return: Tuple (ids, index, attackers, attacked), as in dense_graph.
+    """
+    ids = list(framework.argument_ids())
+    index = {arg_id: i for i, arg_id in enumerate(ids)}
+    attackers = [[index[a] for a in framework.arguments_that_attack(arg_id) if a in index] for arg_id in ids]
+    attacked = [[index[b] for b in framework.arguments_attacked_by(arg_id) if b in index] for arg_id in ids]
+    return ids, index, attackers, attacked
+
+
+def grounded_labelling(attackers, attacked):
+    """
+    Computes the grounded labelling in linear time by propagating from unattacked arguments.
+    :param attackers: Attackers of each argument, as lists of indices.
+    :param attacked: Arguments attacked by each argument, as lists of indices.
+    :return: List of labels (IN, OUT or UNDEC) indexed by argument.
+    """
+    n = len(attackers)
+    labels = [UNDEC] * n
+    # Number of attackers of each argument that are not yet OUT.
+    remaining = [len(attackers[i]) for i in range(n)]
+    queue = [i for i in range(n) if remaining[i] == 0]
+    for i in queue:
+        labels[i] = IN
+    while queue:
+        i = queue.pop()
+        for j in attacked[i]:
+            if labels[j] != UNDEC:
+                continue
+            labels[j] = OUT
+            for k in attacked[j]:
+                remaining[k] -= 1
+                if remaining[k] == 0 and labels[k] == UNDEC:
+                    labels[k] = IN
+                    queue.append(k)
+    return labels
+
+
+def _is_dead_end(labels, attackers, candidates):
+    """
+    A MUST_OUT argument with no BLANK attacker left can never become OUT.
+    """
+    for y in candidates:
+        if labels[y] == MUST_OUT and all(labels[z] != BLANK for z in attackers[y]):
+            return True
+    return False
+
+
+def _label_in(labels, x, attackers, attacked):
+    """
+    Labels x as IN, its targets as OUT and its undefeated attackers as MUST_OUT.
+    :return: False if the resulting labelling cannot lead to an admissible set.
+    """
+    labels[x] = IN
+    touched = []
+    for y in attacked[x]:
+        labels[y] = OUT
+        touched.extend(attackers[y])
+    for z in attackers[x]:
+        if labels[z] != OUT:
+            labels[z] = MUST_OUT
+            touched.append(z)
+    # Arguments that just became OUT may have been the last BLANK attackers of a MUST_OUT argument.
+    return not _is_dead_end(labels, attackers, touched)
+
+
+def _select(labels, attackers, attacked):
+    """
+    Picks the next BLANK argument to branch on.
+    :return: Tuple (argument index, forced), where forced means it belongs to every extension of this branch.
+    """
+    best = None
+    best_score = -1
+    for x, label in enumerate(labels):
+        if label != BLANK:
+            continue
+        # Defended by the current IN set (or waiting on MUST_OUT attackers): always safe to accept.
+        if all(labels[z] in (OUT, MUST_OUT) for z in attackers[x]):
+            return x, True
+        score = len(attacked[x])
+        if any(labels[y] == MUST_OUT for y in attacked[x]):
+            score += len(labels)
+        if score > best_score:
+            best, best_score = x, score
+    return best, False
+
+
+def _preferred_search(labels, attackers, attacked, found):
+    """
+    Enumerates preferred extensions reachable from a partial labelling (Nofal, Atkinson and Dunne, 2014).
+    IN branches are always explored before UNDEC ones, so an admissible set that is not contained in a
+    previously found extension is guaranteed to be maximal.
+    :param labels: Partial labelling; modified in place.
+    :param found: Preferred extensions found so far, as frozensets of indices.
+    """
+    while True:
+        x, forced = _select(labels, attackers, attacked)
+        if x is None:
+            break
+        if forced:
+            if not _label_in(labels, x, attackers, attacked):
+                return
+            continue
+        branch = labels[:]
+        if _label_in(branch, x, attackers, attacked):
+            yield from _preferred_search(branch, attackers, attacked, found)
+        labels[x] = UNDEC
+        if _is_dead_end(labels, attackers, attacked[x]):
+            return
+    if MUST_OUT in labels:
+        return
+    extension = frozenset(i for i, label in enumerate(labels) if label == IN)
+    if not any(extension <= other for other in found):
+        found.append(extension)
+        yield extension
+
+
+def strongly_connected_components(nodes, attacked):
+    """
+    Tarjan's algorithm (iterative), restricted to a subset of the arguments.
+    :param nodes: Argument indices to be decomposed. Attacks leaving this set are ignored.
+    :param attacked: Arguments attacked by each argument, as lists of indices.
+    :return: List of components (lists of indices) in topological order: attackers before attacked.
+    """
+    nodes = list(nodes)
+    member = set(nodes)
+    order = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    for root in nodes:
+        if root in order:
+            continue
+        work = [(root, iter(attacked[root]))]
+        order[root] = low[root] = len(order)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, targets = work[-1]
+            advanced = False
+            for target in targets:
+                if target not in member:
+                    continue
+                if target not in order:
+                    order[target] = low[target] = len(order)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(attacked[target])))
+                    advanced = True
+                    break
+                if target in on_stack:
+                    low[node] = min(low[node], order[target])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                low[work[-1][0]] = min(low[work[-1][0]], low[node])
+            if low[node] == order[node]:
+                component = []
+                while True:
+                    top = stack.pop()
+                    on_stack.discard(top)
+                    component.append(top)
+                    if top == node:
+                        break
+                components.append(component)
+    # Tarjan finds sink components first.
+    components.reverse()
+    return components
+
+
+def _local_extensions(component, state, attackers, attacked):
+    """
+    Preferred extensions of one strongly connected component, given the labels of the components upstream
+    (SCC-recursive schema of Baroni, Giacomin and Guida, 2005).
+    :param component: Argument indices of the component.
+    :param state: Labels (IN, OUT or UNDEC) of the upstream arguments attacking the component.
+    :return: Generator of (extension, out) pairs of sets of indices, labelling the whole component.
+    """
+    members = set(component)
+    defeated = set()
+    provisional = set()
+    for s in component:
+        for a in attackers[s]:
+            if a in members:
+                continue
+            label = state.get(a, OUT)  # Arguments decided by the grounded labelling are never IN here.
+            if label == IN:
+                defeated.add(s)
+            elif label == UNDEC:
+                provisional.add(s)
+    remaining = [s for s in component if s not in defeated]
+    if not remaining:
+        yield set(), defeated
+        return
+    local = {s: i for i, s in enumerate(remaining)}
+    local_attackers = [[local[a] for a in attackers[s] if a in local] for s in remaining]
+    local_attacked = [[local[b] for b in attacked[s] if b in local] for s in remaining]
+    # Provisionally defeated and self-attacking arguments may still be attacked, but never accepted.
+    labels = [UNDEC if s in provisional or i in local_attackers[i] else BLANK for i, s in enumerate(remaining)]
+    for local_extension in _preferred_search(labels, local_attackers, local_attacked, []):
+        extension = {remaining[i] for i in local_extension}
+        out = set(defeated)
+        for i in local_extension:
+            out.update(remaining[j] for j in local_attacked[i])
+        yield extension, out
+
+
+def _local_complete_extensions(component, state, attackers, attacked):
+    """
+    Complete extensions of one strongly connected component, given the labels of the components upstream.
+    Labels are assigned by backtracking; a label is rejected as soon as it contradicts the known labels of the
+    attackers of an argument (IN needs all of them OUT, OUT needs one IN, UNDEC needs neither).
+    :return: Generator of (extension, out) pairs of sets of indices, labelling the whole component.
+    """
+    labels = {}
+
+    def consistent(s):
+        unknown = any_in = not_out = False
+        for a in attackers[s]:
+            label = labels.get(a) if a in members else state.get(a, OUT)
+            if label is None:
+                unknown = True
+            elif label == IN:
+                any_in = True
+            elif label != OUT:
+                not_out = True
+        if labels[s] == IN:
+            return not any_in and not not_out
+        if labels[s] == OUT:
+            return any_in or unknown
+        return not any_in and (unknown or not_out)
+
+    members = set(component)
+    choices = [iter((IN, OUT, UNDEC))]
+    while choices:
+        s = component[len(choices) - 1]
+        label = next(choices[-1], None)
+        if label is None:
+            del labels[s]
+            choices.pop()
+            continue
+        labels[s] = label
+        if not consistent(s) or not all(consistent(t) for t in attacked[s] if t in labels):
+            continue
+        if len(choices) == len(component):
+            yield {t for t in component if labels[t] == IN}, {t for t in component if labels[t] == OUT}
+        else:
+            choices.append(iter((IN, OUT, UNDEC)))
+
+
+def preferred_extensions_dense(attackers, attacked, local_extensions=_local_extensions):
+    """
+    Generator over preferred extensions of a framework given in dense form.
+    Arguments decided by the grounded labelling are fixed first; the rest is split into strongly connected
+    components that are solved one at a time in topological order.
+    :param local_extensions: Extensions of one component, _local_extensions (preferred) or
+    _local_complete_extensions (complete).
+    :return: Frozensets of argument indices.
+    """
+    labels = grounded_labelling(attackers, attacked)
+    grounded = [i for i, label in enumerate(labels) if label == IN]
+    components = strongly_connected_components([i for i, label in enumerate(labels) if label == UNDEC], attacked)
+    if not components:
+        yield frozenset(grounded)
+        return
+    state = {}
+    chosen = []
+    pending = [local_extensions(components[0], state, attackers, attacked)]
+    while pending:
+        depth = len(pending) - 1
+        if len(chosen) > depth:
+            # Undo the labels of the previous choice at this depth.
+            chosen.pop()
+            for s in components[depth]:
+                del state[s]
+        choice = next(pending[-1], None)
+        if choice is None:
+            pending.pop()
+            continue
+        extension, out = choice
+        chosen.append(extension)
+        for s in components[depth]:
+            state[s] = IN if s in extension else OUT if s in out else UNDEC
+        if depth + 1 == len(components):
+            yield frozenset(grounded).union(*chosen)
+        else:
+            pending.append(local_extensions(components[depth + 1], state, attackers, attacked))
+
+
+def _sample_preferred(attackers, attacked, grounded, components, rng):
+    """
+    Draws one preferred extension by walking down the SCC-by-SCC product of preferred_extensions_dense, taking a
+    local extension uniformly at random in each component.
+    :return: Tuple (extension, log_weight): list of indices, and the log of the product of the number of choices
+    met on the way. Weighting samples by exp(log_weight) makes them uniform over extensions (Knuth, 1975).
+    """
+    state = {}
+    extension = list(grounded)
+    log_weight = 0.0
+    for component in components:
+        chosen = None
+        count = 0
+        # Reservoir sampling, so local extensions are never held in memory together.
+        for choice in _local_extensions(component, state, attackers, attacked):
+            count += 1
+            if rng.randrange(count) == 0:
+                chosen = choice
+        local, out = chosen
+        log_weight += math.log(count)
+        extension.extend(local)
+        for s in component:
+            state[s] = IN if s in local else OUT if s in out else UNDEC
+    return extension, log_weight
+
+
+def estimate_occurrence(framework, error=0.05, confidence=0.95, min_samples=100, max_samples=100000, seed=None):
+    """
+    Estimates the fraction of preferred extensions containing each argument by sampling extensions, for frameworks
+    with too many extensions to enumerate. Samples are drawn until the confidence interval of every estimate is
+    within +/- error, or max_samples is reached.
+    :param error: Target half-width of the confidence intervals.
+    :param confidence: Confidence level of the intervals (normal approximation).
+    :param min_samples: Samples drawn before convergence is first checked.
+    :param max_samples: Samples drawn at most.
+    :param seed: Seed of a private random generator. The global one is used by default.
+    :return: Tuple (frequencies, half_width, num_samples): float array in argument_ids() order, the widest
+    half-width reached, and the number of samples drawn.
+    """
+    ids, _, attackers, attacked = dense_graph(framework)
+    labels = grounded_labelling(attackers, attacked)
+    grounded = [i for i, label in enumerate(labels) if label == IN]
+    components = strongly_connected_components([i for i, label in enumerate(labels) if label == UNDEC], attacked)
+    if not components:
+        frequencies = np.zeros(len(ids))
+        frequencies[grounded] = 1.0
+        return frequencies, 0.0, 0
+    rng = random.Random(seed) if seed is not None else random
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+
+    # Weighted sums for the ratio estimator. Weights are kept relative to exp(scale) to avoid overflow.
+    scale = None
+    sum_w = sum_w2 = 0.0
+    sum_wy = np.zeros(len(ids))
+    sum_w2y = np.zeros(len(ids))
+    half_width = math.inf
+    num_samples = 0
+    while num_samples < max_samples:
+        extension, log_weight = _sample_preferred(attackers, attacked, grounded, components, rng)
+        num_samples += 1
+        if scale is None or log_weight > scale:
+            if scale is not None:
+                shrink = math.exp(scale - log_weight)
+                sum_w *= shrink
+                sum_wy *= shrink
+                sum_w2 *= shrink * shrink
+                sum_w2y *= shrink * shrink
+            scale = log_weight
+        w = math.exp(log_weight - scale)
+        sum_w += w
+        sum_w2 += w * w
+        sum_wy[extension] += w
+        sum_w2y[extension] += w * w
+        if num_samples >= min_samples:
+            p = sum_wy / sum_w
+            variance = np.maximum((1 - 2 * p) * sum_w2y + p * p * sum_w2, 0.0)
+            half_width = z * float(np.sqrt(variance).max()) / sum_w
+            if half_width <= error:
+                break
+    return sum_wy / sum_w, half_width, num_samples
+
+
+def _ancestors(x, attackers, allowed):
+    """
+    :return: Set of arguments in allowed with a path of attacks to x, including x.
+    """
+    seen = {x}
+    queue = [x]
+    while queue:
+        y = queue.pop()
+        for z in attackers[y]:
+            if z in allowed and z not in seen:
+                seen.add(z)
+                queue.append(z)
+    return seen
+
+
+def grounded_extension(framework):
+    """
+    :return: Set of argument ids in the grounded extension.
+    """
+    ids, _, attackers, attacked = dense_graph(framework)
+    labels = grounded_labelling(attackers, attacked)
+    return {ids[i] for i, label in enumerate(labels) if label == IN}
+
+
+def preferred_extensions(framework):
+    """
+    Generator over the preferred extensions of a framework.
+    :return: Sets of argument ids, one per extension.
+    """
+    ids, _, attackers, attacked = dense_graph(framework)
+    for extension in preferred_extensions_dense(attackers, attacked):
+        yield {ids[i] for i in extension}
+
+
+def accepted_dense(attackers, attacked, x, semantics="PR", skeptical=True):
+    """
+    Decides acceptance of argument index x, trying the grounded labelling before searching extensions.
+    Only undecided ancestors of x are searched, component by component; distinct labellings of the arguments
+    that attack later components are tracked instead of whole extensions.
+    """
+    labels = grounded_labelling(attackers, attacked)
+    if labels[x] != UNDEC or semantics == "GR":
+        return labels[x] == IN
+    if x in attackers[x]:
+        return False
+    undecided = {i for i, label in enumerate(labels) if label == UNDEC}
+    components = strongly_connected_components(_ancestors(x, attackers, undecided), attacked)
+    position = {s: k for k, component in enumerate(components) for s in component}
+    # Index of the last component attacked by each argument: it must be remembered until then.
+    last_target = {s: max((position[t] for t in attacked[s] if t in position), default=-1) for s in position}
+
+    # Decided attackers of undecided arguments are all OUT, which is the default label of _local_extensions.
+    states = {()}
+    for k, component in enumerate(components):
+        last = k + 1 == len(components)
+        next_states = set()
+        for frontier in states:
+            state = dict(frontier)
+            for extension, out in _local_extensions(component, state, attackers, attacked):
+                if last:
+                    if skeptical and x not in extension:
+                        return False
+                    if not skeptical and x in extension:
+                        return True
+                    continue
+                for s in component:
+                    state[s] = IN if s in extension else OUT if s in out else UNDEC
+                next_states.add(tuple(sorted((s, label) for s, label in state.items()
+                                             if s in position and last_target[s] > k)))
+        states = next_states
+    return skeptical
+
+
+def is_skeptically_accepted(framework, argument_id, semantics="PR"):
+    ids, index, attackers, attacked = dense_graph(framework)
+    if argument_id not in index:
+        return False
+    return accepted_dense(attackers, attacked, index[argument_id], semantics, skeptical=True)
+
+
+def is_credulously_accepted(framework, argument_id, semantics="PR"):
+    ids, index, attackers, attacked = dense_graph(framework)
+    if argument_id not in index:
+        return False
+    return accepted_dense(attackers, attacked, index[argument_id], semantics, skeptical=False)
+
+
+def kernel_applies(semantics, arg_str=""):
+    """
+    :return: Whether kernel_dense preserves the answer to this problem.
+    """
+    return bool(arg_str) and semantics.split("-")[0] in ("DS", "DC") and semantics.split("-")[1] in ("GR", "CO", "PR")
+
+
+def kernel_dense(attackers, attacked, x):
+    """
+    Shrinks a framework to an induced subframework giving the same DS/DC answers for x under grounded, complete and
+    preferred semantics (not stable semantics, and not enumeration).
+    Arguments decided by the grounded labelling are dropped, then those that cannot reach x through attacks, then
+    arguments with the same attackers and targets as another kept argument are merged into it.
+    :return: Tuple (kept, groups): sorted list of kept indices, and dict from each kept index to the indices it
+    stands for (itself included).
+    """
+    labels = grounded_labelling(attackers, attacked)
+    if labels[x] == IN:
+        return [x], {x: [x]}
+    if labels[x] == OUT:
+        # The attacker that first made x OUT is not attacked by x, so {x, y} keeps x OUT.
+        targets = set(attacked[x])
+        y = next(y for y in attackers[x] if labels[y] == IN and y not in targets)
+        return sorted((x, y)), {x: [x], y: [y]}
+    undecided = {i for i, label in enumerate(labels) if label == UNDEC}
+    kept = _ancestors(x, attackers, undecided)
+    groups = {i: [i] for i in kept}
+    merged = True
+    while merged:
+        merged = False
+        representatives = {}
+        for i in sorted(kept, key=lambda i: (i != x, i)):
+            key = (frozenset(kept.intersection(attackers[i])), frozenset(kept.intersection(attacked[i])))
+            representative = representatives.setdefault(key, i)
+            if representative != i:
+                groups[representative].extend(groups.pop(i))
+                merged = True
+        kept = set(representatives.values())
+    return sorted(kept), groups
+
+
+def attack_matrix(framework):
+    """
+    Sparse attack matrix of a framework, where matrix[i, j] means ids[i] attacks ids[j].
+    Frozen frameworks lend their CSR arrays; other frameworks are read through dense_graph.
+    :return: Tuple (ids, index, matrix), matrix being a scipy.sparse CSR array of float32 ones.
+    """
+    if hasattr(framework, "attacks_indptr"):
+        ids, index, indptr, indices = framework.ids, framework.index, framework.attacks_indptr, \
+            framework.attacks_indices
+    else:
+        ids, index, _, attacked = dense_graph(framework)
+        indptr = np.concatenate(([0], np.cumsum([len(targets) for targets in attacked]))).astype(np.int64)
+        indices = np.fromiter((j for targets in attacked for j in targets), dtype=np.int64, count=int(indptr[-1]))
+    matrix = csr_array((np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(len(ids), len(ids)))
+    return ids, index, matrix
+
+
+def batch_grounded_labelling(matrix, masks):
+    """
+    Computes the grounded labelling of many pruned copies of the same framework at once.
+    Iterates the characteristic function on all copies simultaneously until none of them changes.
+    :param matrix: Sparse attack matrix (n x n) of the base framework, see attack_matrix.
+    :param masks: Boolean matrix (copies x n) with the arguments kept in each copy.
+    :return: Tuple (IN, OUT) of boolean matrices shaped like masks. Arguments in neither are UNDEC.
+    """
+    # Products are taken as transposed @ copies.T, so the sparse matrix stays on the left.
+    transposed = matrix.T.tocsr()
+    labelled_in = np.zeros(masks.shape, dtype=bool)
+    labelled_out = np.zeros(masks.shape, dtype=bool)
+    while True:
+        # An argument is IN once none of its active attackers can still be accepted.
+        undefeated = (masks & ~labelled_out).astype(np.float32)
+        new_in = masks & ((transposed @ undefeated.T).T == 0)
+        new_out = masks & ((transposed @ new_in.T.astype(np.float32)).T > 0)
+        if np.array_equal(new_in, labelled_in) and np.array_equal(new_out, labelled_out):
+            return labelled_in, labelled_out
+        labelled_in, labelled_out = new_in, new_out
+
+
+def batch_accepted(framework, masks, argument_id, semantics="PR", skeptical=True, chunk_size=4096):
+    """
+    Decides acceptance of one argument in many pruned copies of the same framework.
+    Copies are solved together by the grounded fixpoint; only copies where the argument is left
+    undecided are searched individually for preferred extensions.
+    :param framework: The base framework.
+    :param masks: Boolean matrix (copies x arguments), columns in framework.argument_ids() order.
+    :param argument_id: The queried argument.
+    :param semantics: "PR" or "GR".
+    :param skeptical: Skeptical (DS) if True, credulous (DC) otherwise.
+    :param chunk_size: Maximum number of copies labelled at once, bounding memory usage.
+    :return: Boolean array with one entry per copy.
+    """
+    ids, index, matrix = attack_matrix(framework)
+    masks = np.asarray(masks, dtype=bool)
+    if argument_id not in index:
+        return np.zeros(len(masks), dtype=bool)
+    x = index[argument_id]
+    # Copies with the same arguments are the same framework: solve each distinct one only once.
+    masks, inverse = np.unique(masks, axis=0, return_inverse=True)
+    accepted = np.zeros(len(masks), dtype=bool)
+    all_attackers = all_attacked = None
+    for start in range(0, len(masks), chunk_size):
+        chunk = masks[start:start + chunk_size]
+        labelled_in, labelled_out = batch_grounded_labelling(matrix, chunk)
+        accepted[start:start + len(chunk)] = labelled_in[:, x]
+        if semantics == "GR":
+            fast_path_counts["taken"] += len(chunk)
+            continue
+        undecided = chunk[:, x] & ~labelled_in[:, x] & ~labelled_out[:, x]
+        fast_path_counts["fallback"] += int(undecided.sum())
+        fast_path_counts["taken"] += len(chunk) - int(undecided.sum())
+        if undecided.any() and all_attackers is None:
+            _, _, all_attackers, all_attacked = dense_graph(framework)
+        for row in np.flatnonzero(undecided):
+            active = chunk[row].tolist()
+            attackers = [[i for i in all_attackers[j] if active[i]] if active[j] else [] for j in range(len(ids))]
+            attacked = [[j for j in all_attacked[i] if active[j]] if active[i] else [] for i in range(len(ids))]
+            accepted[start + row] = accepted_dense(attackers, attacked, x, semantics, skeptical)
+    return accepted[inverse.reshape(-1)]
+
+
+def gray_order(masks):
+    """
+    Orders copies so that consecutive ones differ in few arguments: rows are sorted by their rank in the reflected
+    binary Gray code, reading the columns that vary as bits (first column most significant).
+    :param masks: Boolean matrix (copies x arguments).
+    :return: Permutation of the row indices.
+    """
+    masks = np.asarray(masks, dtype=bool)
+    varying = masks[:, (masks != masks[:1]).any(axis=0)]
+    if varying.shape[1] == 0:
+        return np.arange(len(masks))
+    # The Gray code rank of a bit string is the running XOR of its bits.
+    ranks = np.cumsum(varying, axis=1) % 2
+    return np.lexsort(ranks.T[::-1])
+
+
+class IncrementalAcceptance:
+    """
+    Decides acceptance of one argument in a sequence of pruned copies of the same framework.
+    The grounded labelling is kept between copies: toggling arguments only relabels the arguments they can reach,
+    since the grounded label of an argument depends on its ancestors alone. Answers for copies where the argument
+    is left undecided are remembered by their undecided ancestors, which is all the preferred search looks at.
+    """
+    def __init__(self, attackers, attacked, x, semantics="PR", skeptical=True):
+        """
+        :param attackers: Attackers of each argument, as lists of indices.
+        :param attacked: Arguments attacked by each argument, as lists of indices.
+        :param x: Index of the queried argument.
+        :param semantics: "PR" or "GR".
+        :param skeptical: Skeptical (DS) if True, credulous (DC) otherwise.
+        """
+        self.attackers = attackers
+        self.attacked = attacked
+        self.x = x
+        self.semantics = semantics
+        self.skeptical = skeptical
+        self.active = [True] * len(attackers)
+        # None marks arguments that are toggled off.
+        self.labels = grounded_labelling(attackers, attacked)
+        self.answers = {}
+        self.relabelled = 0
+
+    def set_active(self, active):
+        """
+        :param active: Boolean array of the arguments present in the next copy.
+        """
+        self.toggle(np.flatnonzero(np.asarray(self.active) != np.asarray(active, dtype=bool)).tolist())
+
+    def toggle(self, indices):
+        """
+        Adds the given arguments if absent, removes them otherwise, and relabels what they reach.
+        """
+        if not indices:
+            return
+        attackers, attacked, labels, active = self.attackers, self.attacked, self.labels, self.active
+        for i in indices:
+            active[i] = not active[i]
+        reached = set(indices)
+        stack = list(indices)
+        while stack:
+            for t in attacked[stack.pop()]:
+                if active[t] and t not in reached:
+                    reached.add(t)
+                    stack.append(t)
+        self.relabelled += len(reached)
+
+        for y in reached:
+            labels[y] = UNDEC if active[y] else None
+        # Same propagation as grounded_labelling, with labels outside the reached set fixed.
+        remaining = {}
+        queue = []
+        for y in reached:
+            if not active[y]:
+                continue
+            count = 0
+            for z in attackers[y]:
+                if not active[z] or (labels[z] == OUT and z not in reached):
+                    continue
+                if labels[z] == IN and z not in reached:
+                    count = -1
+                    break
+                count += 1
+            if count == -1:
+                labels[y] = OUT
+                queue.append(y)
+            elif count == 0:
+                labels[y] = IN
+                queue.append(y)
+            else:
+                remaining[y] = count
+        while queue:
+            y = queue.pop()
+            for t in attacked[y]:
+                if t not in remaining or labels[t] != UNDEC:
+                    continue
+                if labels[y] == IN:
+                    labels[t] = OUT
+                    queue.append(t)
+                else:
+                    remaining[t] -= 1
+                    if remaining[t] == 0:
+                        labels[t] = IN
+                        queue.append(t)
+
+    def accepted(self):
+        """
+        :return: Whether the argument is accepted in the current copy.
+        """
+        x, labels = self.x, self.labels
+        if labels[x] != UNDEC or self.semantics == "GR":
+            fast_path_counts["taken"] += 1
+            return labels[x] == IN
+        fast_path_counts["fallback"] += 1
+        ancestors = [x]
+        seen = {x}
+        for y in ancestors:
+            for z in self.attackers[y]:
+                if labels[z] == UNDEC and z not in seen:
+                    seen.add(z)
+                    ancestors.append(z)
+        key = frozenset(seen)
+        if key not in self.answers:
+            local = {y: i for i, y in enumerate(ancestors)}
+            attackers = [[local[z] for z in self.attackers[y] if z in local] for y in ancestors]
+            attacked = [[local[t] for t in self.attacked[y] if t in local] for y in ancestors]
+            self.answers[key] = accepted_dense(attackers, attacked, 0, self.semantics, self.skeptical)
+        return self.answers[key]
+
+
+def incremental_accepted(framework, masks, argument_id, semantics="PR", skeptical=True):
+    """
+    Same as batch_accepted, but walks the copies in Gray code order with an IncrementalAcceptance, so each copy is
+    solved by relabelling what changed since the previous one.
+    """
+    ids, index, attackers, attacked = dense_graph(framework)
+    masks = np.asarray(masks, dtype=bool)
+    if argument_id not in index:
+        return np.zeros(len(masks), dtype=bool)
+    masks, inverse = np.unique(masks, axis=0, return_inverse=True)
+    solver = IncrementalAcceptance(attackers, attacked, index[argument_id], semantics, skeptical)
+    accepted = np.zeros(len(masks), dtype=bool)
+    for row in gray_order(masks):
+        solver.set_active(masks[row])
+        accepted[row] = solver.accepted()
+    return accepted[inverse.reshape(-1)]
+
+
+def extension_bitsets(framework, semantics="PR", first=None, max_extensions=None):
+    """
+    Generator over the extensions of a framework as bitsets, where bit i stands for the i-th argument of
+    framework.argument_ids(). Extensions are found one at a time, so huge extension sets never need to be held
+    in memory.
+    :param semantics: "PR", "CO" or "GR".
+    :param first: Stop after this many extensions.
+    :param max_extensions: Raise a RuntimeError if the framework has more extensions than this.
+    :return: Generator of ints.
+    """
+    ids, _, attackers, attacked = dense_graph(framework)
+    if semantics == "GR":
+        labels = grounded_labelling(attackers, attacked)
+        found = iter([[i for i, label in enumerate(labels) if label == IN]])
+    elif semantics == "PR":
+        found = preferred_extensions_dense(attackers, attacked)
+    elif semantics == "CO":
+        found = preferred_extensions_dense(attackers, attacked, _local_complete_extensions)
+    else:
+        raise ValueError("Native solver cannot enumerate {} extensions".format(semantics))
+    for count, extension in enumerate(found, 1):
+        if max_extensions is not None and count > max_extensions:
+            raise RuntimeError("More than {} {} extensions".format(max_extensions, semantics))
+        bitset = 0
+        for i in extension:
+            bitset |= 1 << i
+        yield bitset
+        if first is not None and count >= first:
+            return
+
+
+def extensions(framework, semantics="PR", first=None, max_extensions=None):
+    """
+    Same as extension_bitsets, yielding sets of argument ids.
+    """
+    ids = dense_graph(framework)[0]
+    for bitset in extension_bitsets(framework, semantics, first, max_extensions):
+        extension = set()
+        while bitset:
+            lowest = bitset & -bitset
+            extension.add(ids[lowest.bit_length() - 1])
+            bitset ^= lowest
+        yield extension
+
+
+def parse_extensions(output, id_type=int):
+    """
+    Parses the extensions printed by an ICCMA solver for an EE problem, e.g. "[[1,2],[3]]".
+    :return: Generator of sets of argument ids.
+    """
+    output = output.strip()
+    if output.startswith("[") and output.endswith("]"):
+        output = output[1:-1]
+    for match in EXTENSION_PATTERN.finditer(output):
+        yield {id_type(token) for token in match.group(1).replace(",", " ").split()}
+
+
+def incidence_chunks(extensions, ids, chunk_size=1024):
+    """
+    Converts a stream of extensions into boolean incidence matrices (extensions x arguments).
+    :param extensions: Iterable of sets of argument ids.
+    :param ids: Argument ids, in column order.
+    :param chunk_size: Number of extensions (rows) per yielded matrix.
+    :return: Generator of boolean matrices.
+    """
+    index = {arg_id: i for i, arg_id in enumerate(ids)}
+    rows = []
+    for extension in extensions:
+        rows.append([index[arg_id] for arg_id in extension if arg_id in index])
+        if len(rows) == chunk_size:
+            yield _incidence(rows, len(ids))
+            rows = []
+    if rows:
+        yield _incidence(rows, len(ids))
+
+
+def bitset_incidence_chunks(bitsets, num_arguments, chunk_size=1024):
+    """
+    Same as incidence_chunks, for extensions given as bitsets (see extension_bitsets).
+    """
+    num_bytes = (num_arguments + 7) // 8
+    rows = []
+    for bitset in bitsets:
+        rows.append(bitset.to_bytes(num_bytes, "little"))
+        if len(rows) == chunk_size:
+            yield _bitset_incidence(rows, num_arguments)
+            rows = []
+    if rows:
+        yield _bitset_incidence(rows, num_arguments)
+
+
+def _bitset_incidence(rows, num_columns):
+    packed = np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), -1)
+    return np.unpackbits(packed, axis=1, count=num_columns, bitorder="little").astype(bool)
+
+
+def _incidence(rows, num_columns):
+    matrix = np.zeros((len(rows), num_columns), dtype=bool)
+    for r, columns in enumerate(rows):
+        matrix[r, columns] = True
+    return matrix
+
+
+def incidence_matrix(extensions, ids):
+    """
+    :return: Boolean matrix (extensions x arguments) with one row per extension.
+    """
+    chunks = list(incidence_chunks(extensions, ids))
+    if not chunks:
+        return np.zeros((0, len(ids)), dtype=bool)
+    return np.concatenate(chunks)
+
+
+def well_founded_answer(framework, semantics, arg_str=""):
+    """
+    Answers a problem from the grounded labelling alone, when that is enough.
+    If the queried argument is IN or OUT in the grounded labelling, it is IN or OUT in every complete (hence
+    preferred) extension. If no argument is undecided (e.g. the framework is acyclic), the grounded extension
+    is the only complete, preferred and stable extension.
+    :return: Output formatted like mu-toksia's stdout, or None if a full solver is needed.
+    """
+    mode, sem = semantics.split("-")
+    if sem not in ("GR", "CO", "PR", "ST") or (mode != "EE" and not arg_str):
+        return None
+    ids, index, attackers, attacked = dense_graph(framework)
+    labels = grounded_labelling(attackers, attacked)
+    total = UNDEC not in labels
+    if mode == "EE" and (total or sem == "GR"):
+        fast_path_counts["taken"] += 1
+        grounded = sorted(ids[i] for i, label in enumerate(labels) if label == IN)
+        return "[[{}]]\n".format(",".join(str(arg_id) for arg_id in grounded))
+    if mode in ("DS", "DC") and (total or sem != "ST"):
+        x = index.get(int(arg_str))
+        if x is None or labels[x] != UNDEC or sem == "GR":
+            fast_path_counts["taken"] += 1
+            return "YES\n" if x is not None and labels[x] == IN else "NO\n"
+    fast_path_counts["fallback"] += 1
+    return None
+
+
+def solve(framework, semantics, arg_str=""):
+    """
+    Answers an ICCMA-style problem in process.
+    :param framework: The framework to be queried.
+    :param semantics: Problem name, e.g. "DS-PR". Must be in SUPPORTED_PROBLEMS.
+    :param arg_str: The string defining the argument.
+    :return: Output formatted like mu-toksia's stdout ("YES", "NO" or a list of extensions).
+    """
+    if not supports(semantics):
+        raise ValueError("Native solver does not support {}".format(semantics))
+    mode, sem = semantics.split("-")
+    if mode == "EE":
+        found = ["[{}]".format(",".join(str(arg_id) for arg_id in sorted(extension)))
+                 for extension in extensions(framework, sem)]
+        return "[{}]\n".format(",".join(found))
+    if not arg_str:
+        raise ValueError("Problem {} requires an argument".format(semantics))
+    if sem == "CO":
+        # Skeptical acceptance under complete semantics is membership of the grounded extension; credulous
+        # acceptance is the same as under preferred semantics.
+        sem = "GR" if mode == "DS" else "PR"
+    if mode == "DS":
+        accepted = is_skeptically_accepted(framework, int(arg_str), sem)
+    else:
+        accepted = is_credulously_accepted(framework, int(arg_str), sem)
+    return "YES\n" if accepted else "NO\n"
@@ -0,0 +1,165 @@
+"""
+Power index rankings of arguments (port of compute_rank.js).
+Arguments are the players of a simple game whose winning coalitions are the extensions of a framework: v(S) is 1
+if S is exactly an extension and 0 otherwise. Indices are computed for the extensions (IN) and for the sets of
+arguments they attack (OUT); arguments are ranked by descending IN index, then ascending OUT index.
+Games are given as boolean incidence matrices (coalitions x arguments), e.g. from native_solver.incidence_matrix.
+"""
+import math
+import random
+
+import numpy as np
+
+import native_solver
+
+POWER_INDICES = ("SV", "BI")
+
+
+def _winning(incidence):
+    """
+    :return: The distinct rows of the incidence matrix, as a boolean matrix.
+    """
+    incidence = np.asarray(incidence, dtype=bool)
+    if len(incidence) == 0:
+        return incidence
+    return np.unique(incidence, axis=0)
+
+
+def shapley_values(incidence):
+    """
+    Exact Shapley values. v(S + i) - v(S) is only non-zero when S + i or S is winning, so the sum over all
+    coalitions S reduces to a sum over the winning ones:
+        SV(i) = sum over winning W containing i of w(|W| - 1) - sum over winning W without i of w(|W|),
+    where w(s) = s! (n - s - 1)! / n!.
+    :param incidence: Boolean matrix (winning coalitions x players).
+    :return: Float array with one value per player.
+    """
+    winning = _winning(incidence)
+    n = winning.shape[1]
+    sizes = winning.sum(axis=1)
+    weights = np.array([math.exp(math.lgamma(s + 1) + math.lgamma(n - s) - math.lgamma(n + 1)) for s in range(n)]
+                       + [0.0])
+    with_player = weights[np.maximum(sizes - 1, 0)]
+    without_player = weights[sizes]
+    return winning.T.astype(float) @ with_player - (~winning).T.astype(float) @ without_player
+
+
+def banzhaf_indices(incidence):
+    """
+    Exact Banzhaf indices, reduced to a sum over winning coalitions as in shapley_values:
+        BI(i) = (#winning containing i - #winning without i) / 2^(n - 1).
+    :param incidence: Boolean matrix (winning coalitions x players).
+    :return: Float array with one value per player.
+    """
+    winning = _winning(incidence)
+    n = winning.shape[1]
+    with_player = winning.sum(axis=0)
+    return np.ldexp((2 * with_player - len(winning)).astype(float), -(n - 1)) if n else np.zeros(0)
+
+
+def _hashes(winning, rng):
+    """
+    Zobrist hashing: each player gets a random 64-bit key and a coalition hashes to the XOR of its players' keys,
+    so adding or removing a player is a single XOR.
+    :return: Tuple (keys, winning_hashes).
+    """
+    keys = rng.integers(0, np.iinfo(np.uint64).max, size=winning.shape[1], dtype=np.uint64, endpoint=True)
+    winning_hashes = np.bitwise_xor.reduce(np.where(winning, keys, np.uint64(0)), axis=1)
+    return keys, winning_hashes
+
+
+def _generator(seed):
+    # Follow the global random module when no seed is given, so seeded experiments stay reproducible.
+    return np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+
+
+def sampled_shapley_values(incidence, num_samples=1000, seed=None, chunk_size=1024):
+    """
+    Monte Carlo Shapley values: the average marginal contribution of each player when joining the players before
+    it in random permutations.
+    :param incidence: Boolean matrix (winning coalitions x players).
+    :param num_samples: Number of permutations.
+    :param seed: Seed of a private random generator.
+    :return: Float array with one value per player.
+    """
+    winning = _winning(incidence)
+    n = winning.shape[1]
+    rng = _generator(seed)
+    keys, winning_hashes = _hashes(winning, rng)
+    totals = np.zeros(n)
+    for start in range(0, num_samples, chunk_size):
+        rows = min(chunk_size, num_samples - start)
+        permutations = np.argsort(rng.random((rows, n)), axis=1)
+        prefixes = np.zeros((rows, n + 1), dtype=np.uint64)
+        np.bitwise_xor.accumulate(keys[permutations], axis=1, out=prefixes[:, 1:])
+        wins = np.isin(prefixes, winning_hashes).astype(float)
+        np.add.at(totals, permutations, wins[:, 1:] - wins[:, :-1])
+    return totals / num_samples
+
+
+def sampled_banzhaf_indices(incidence, num_samples=1000, seed=None, chunk_size=1024):
+    """
+    Monte Carlo Banzhaf indices: the average marginal contribution of each player to uniformly random coalitions.
+    :param incidence: Boolean matrix (winning coalitions x players).
+    :param num_samples: Number of random coalitions.
+    :param seed: Seed of a private random generator.
+    :return: Float array with one value per player.
+    """
+    winning = _winning(incidence)
+    n = winning.shape[1]
+    rng = _generator(seed)
+    keys, winning_hashes = _hashes(winning, rng)
+    totals = np.zeros(n)
+    for start in range(0, num_samples, chunk_size):
+        rows = min(chunk_size, num_samples - start)
+        coalitions = rng.random((rows, n)) < 0.5
+        hashes = np.bitwise_xor.reduce(np.where(coalitions, keys, np.uint64(0)), axis=1)[:, None]
+        toggled = hashes ^ keys
+        with_player = np.where(coalitions, hashes, toggled)
+        without_player = np.where(coalitions, toggled, hashes)
+        totals += (np.isin(with_player, winning_hashes).astype(float)
+                   - np.isin(without_player, winning_hashes)).sum(axis=0)
+    return totals / num_samples
+
+
+def out_incidence(framework, incidence):
+    """
+    :param incidence: Boolean matrix (extensions x arguments), columns in framework.argument_ids() order.
+    :return: Boolean matrix of the arguments attacked by each extension.
+    """
+    _, _, matrix = native_solver.attack_matrix(framework)
+    return (matrix.T @ np.asarray(incidence, dtype=np.float32).T).T > 0
+
+
+def compute_power_index(framework, index="SV", semantics="PR", num_samples=None, seed=None):
+    """
+    Computes a power index of every argument over the extensions of a framework.
+    :param index: "SV" (Shapley value) or "BI" (Banzhaf index).
+    :param semantics: Semantics of the extensions (see native_solver.extensions).
+    :param num_samples: If set, estimate the indices from this many random samples instead of computing them exactly.
+    :param seed: Seed of the samples.
+    :return: Dict from argument id to an (IN index, OUT index) tuple.
+    """
+    if index not in POWER_INDICES:
+        raise ValueError("Unknown power index: {}".format(index))
+    ids = list(framework.argument_ids())
+    incidence = native_solver.incidence_matrix(native_solver.extensions(framework, semantics), ids)
+    if num_samples is None:
+        compute = shapley_values if index == "SV" else banzhaf_indices
+    else:
+        sampled = sampled_shapley_values if index == "SV" else sampled_banzhaf_indices
+        compute = lambda games: sampled(games, num_samples, seed)
+    in_values = compute(incidence)
+    out_values = compute(out_incidence(framework, incidence))
+    return {arg_id: (in_value, out_value)
+            for arg_id, in_value, out_value in zip(ids, in_values.tolist(), out_values.tolist())}
+
+
+def rank(power):
+    """
+    Orders arguments as sortByPI in compute_rank.js: descending IN index, then ascending OUT index, then id.
+    Indices are compared to 5 decimal places.
+    :param power: Dict from argument id to an (IN index, OUT index) tuple.
+    :return: List of argument ids.
+    """
+    return sorted(power, key=lambda arg_id: (-round(power[arg_id][0], 5), round(power[arg_id][1], 5), arg_id))
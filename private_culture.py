@@ -7,7 +7,8 @@ import logging, sys
 import os
 import numpy as np
 
-from base_culture import Culture
+import framework_io
+from base_culture import Culture, always_true
 from functools import partial
 from argument import Argument, PrivateArgument, ArgumentationFramework
 
@@ -20,9 +21,19 @@ if DEBUG_FILE:
         os.remove(LOG_FILENAME)
     logging.basicConfig(filename=LOG_FILENAME, level=logging.DEBUG)
 
-def always_true(*args, **kwargs):
-    # To be used as a function pointer.
-    return True
+
+def verifier_prototype(idx, self_agent, other_agent):
+    return self_agent.properties[idx] > other_agent.properties[idx]
+
+
+def generate_verifier_function(idx):
+    """
+    This helper function generates a unique verifier function for the culture arguments.
+    :param idx: The argument ID.
+    :return: A partial function object containing a callable verifier function prototype.
+    """
+    return partial(verifier_prototype, idx)
+
 
 class RandomCulture(Culture):
     """
@@ -38,7 +49,6 @@ class RandomCulture(Culture):
         super().__init__()
         self.name = "Sample"
         self.properties = {}
-        self.raw_alteroceptive_framework = None
 
         self.create_random_properties()
         # if DEBUG_FILE:
@@ -57,44 +67,47 @@ class RandomCulture(Culture):
         for i in range(0, self.num_properties):
             self.properties[i] = random.randint(0, 1000)
 
-    def load_framework(self):
-        def generate_verifier_function(idx):
-            """
-            This helper function generates a unique verifier function for the culture arguments.
-            :param idx: The argument ID.
-            :return: A partial function object containing a callable verifier function prototype.
-            """
-            def verifier_prototype(idx, self_agent, other_agent):
-                return self_agent.properties[idx] > other_agent.properties[idx]
-
-            return partial(verifier_prototype, idx)
-
+    def load_framework(self, filename='sample2.apx'):
         random_costs = []
         for i in range(1, 20):
             random_costs.append(random.randint(1, 20))
 
-        # Loading argumentation framework from aspartix file.
-        with open('sample2.apx', 'r') as file:
-            lines = file.readlines()
-            for line in lines:
-                if "arg" in line:
-                    arg_id = int(line[line.find("(")+1 : line.find(")")])
-                    new_arg = PrivateArgument(arg_id= arg_id,
-                                              descriptive_text=str(arg_id),
-                                              privacy_cost= 0 if arg_id == 0 else random_costs[int(arg_id/4)])
-                    if arg_id == 0:
-                        new_arg.set_verifier(always_true)
-                    else:
-                        new_arg.set_verifier(generate_verifier_function(idx=new_arg.id()))
-                    self.AF.add_argument(new_arg)
-                if "att" in line:
-                    attack = line[line.find("(")+1 : line.find(")")]
-                    pair = attack.split(",")
-                    attacker = int(pair[0])
-                    attacked = int(pair[1])
-                    self.AF.add_attack(attacker, attacked)
+        # Loading argumentation framework from aspartix file, one line at a time.
+        with open(filename, 'r') as file:
+            for item in framework_io.read_aspartix(file):
+                if item[0] == "att":
+                    self.AF.add_attack(item[1], item[2])
+                    continue
+                arg_id = item[1]
+                new_arg = PrivateArgument(arg_id= arg_id,
+                                          descriptive_text=str(arg_id),
+                                          privacy_cost= 0 if arg_id == 0 else random_costs[int(arg_id/4)])
+                if arg_id == 0:
+                    new_arg.set_verifier(always_true)
+                else:
+                    new_arg.set_verifier(generate_verifier_function(idx=new_arg.id()))
+                self.AF.add_argument(new_arg)
         # self.argumentation_framework.stats()
 
+    def save_framework_binary(self, filename):
+        """
+        Saves the culture's framework (ids, privacy costs and attacks) in NumPy binary format, as a directory of
+        .npy files.
+        """
+        framework_io.save_binary(self.AF, filename)
+
+    def load_framework_binary(self, filename):
+        """
+        Replaces the culture's framework with one saved by save_framework_binary and regenerates
+        the alteroceptive framework.
+        """
+        self.AF = ArgumentationFramework.from_arrays(*framework_io.load_binary(filename))
+        for argument in self.AF.arguments():
+            if argument.id() == 0:
+                argument.set_verifier(always_true)
+            else:
+                argument.set_verifier(generate_verifier_function(idx=argument.id()))
+        self.generate_alteroceptive_framework()
 
     def create_arguments(self):
         """
@@ -110,18 +123,6 @@ class RandomCulture(Culture):
         motion.set_verifier(always_true)  # Propositional arguments are always valid.
         args.append(motion)
 
-        def generate_verifier_function(idx):
-            """
-            This helper function generates a unique verifier function for the culture arguments.
-            :param idx: The argument ID.
-            :return: A partial function object containing a callable verifier function prototype.
-            """
-            def verifier_prototype(idx, self_agent, other_agent):
-                return self_agent.properties[idx] > other_agent.properties[idx]
-
-            # idx = random.randrange(1, self.num_properties)
-            return partial(verifier_prototype, idx)
-
         for i in range(1, self.num_args):
             # Generating random arguments to test solver.
             new_arg = PrivateArgument(arg_id = i,
@@ -156,15 +157,10 @@ class RandomCulture(Culture):
             connected.add(a)
             connected.add(b)
 
-        for arg_id in self.AF.all_arguments.copy().keys():
-            if arg_id not in connected:
-                self.AF.remove_argument(arg_id)
+        self.AF.remove_arguments([arg_id for arg_id in self.AF.argument_ids() if arg_id not in connected])
         # self.argumentation_framework.make_spanning_graph()
 
-        leaves = set()
-        for id in self.AF.argument_ids():
-            if id not in self.AF.attacked_by().keys():
-                leaves.add(id)
+        leaves = self.AF.to_sparse().unattacked()
         # print("Number of maximal arguments before: {}".format(len(leaves)))
 
         # self.argumentation_framework.stats()
@@ -172,123 +168,67 @@ class RandomCulture(Culture):
     def define_attacks_transitive(self, ensure_single_winner=True):
         """
         Defines attack relationships present in the culture.
+        Every random attack a -> b is replicated so that a also attacks everything b reaches, ensuring transitivity.
+        Direct attacks and reachability are kept as bitset rows (one bit per argument, packed in 64-bit words), so
+        replicating an attack is a few vectorised ORs instead of a breadth-first search.
         :return: Attack relationships.
         """
+        n = self.num_args
+        words = (n + 63) // 64
+        attacks = np.zeros((n, words), dtype=np.uint64)
+        # reach[x]: arguments x attacks through one or more attacks. reached_by is its transpose.
+        reach = np.zeros((n, words), dtype=np.uint64)
+        reached_by = np.zeros((n, words), dtype=np.uint64)
 
-        def replicate_attacks(a, to_visit, visited):
-            """
-            Performs a breadth-first search to make sure that attacks are replicated to
-            ensure transitivity.
-            :param a: Current argument.
-            """
-            while to_visit:
-                current_arg = to_visit.pop()
-                if current_arg in visited:
-                    continue
-                if current_arg in self.AF.arguments_that_attack(a):
-                    continue
-                if a > current_arg:
-                    self.AF.add_attack(a, current_arg)
-                to_visit.update(self.AF.arguments_attacked_by(current_arg))
-                visited.add(current_arg)
+        def bit(i):
+            row = np.zeros(words, dtype=np.uint64)
+            row[i >> 6] = np.uint64(1) << np.uint64(i & 63)
+            return row
+
+        def members(rows):
+            return np.unpackbits(rows.astype("<u8").view(np.uint8), axis=-1, bitorder="little")[..., :n]
 
         # Use a stochastic approach to building the graph.
-        num_attacks = self.num_args * 8
+        num_attacks = n * 8
         connected = set()
         connected.add(0)
+        # Same elements as connected, in a list so random picks need no copy.
+        connected_list = [0]
         for i in range(num_attacks):
             a = b = 0
             while a == b:  # Avoid self-attacks.
-                a = random.randint(1, self.num_args-1)
-                b = random.choice(list(connected))
+                a = random.randint(1, n - 1)
+                b = random.choice(connected_list)
                 # Avoid double arrows.
-                if b in self.AF.arguments_that_attack(a) or b > a:
+                if (int(attacks[b, a >> 6]) >> (a & 63)) & 1 or b > a:
                     a = b = 0
                     continue
-            self.AF.add_attack(a, b)
-            connected.add(a)
-            connected.add(b)
-
-            # Replicate attacks recursively
-            to_visit = self.AF.arguments_attacked_by(b).copy()
-            visited = set()
-
-            replicate_attacks(a, to_visit, visited)
-
-        for arg_id in self.AF.all_arguments.copy().keys():
-            if arg_id not in connected:
-                self.AF.remove_argument(arg_id)
-
-        leaves = set()
-        for id in self.AF.argument_ids():
-            if id not in self.AF.attacked_by().keys():
-                leaves.add(id)
+            replicated = reach[b] | bit(b)
+            attacks[a] |= replicated
+            for arg_id in (a, b):
+                if arg_id not in connected:
+                    connected.add(arg_id)
+                    connected_list.append(arg_id)
+
+            # Propagate what a now reaches to a and everything that reaches a.
+            # Attacks go from higher to lower ids, so only the words up to b (resp. from a) can change.
+            low, high = a >> 6, (b >> 6) + 1
+            new = replicated[:high] & ~reach[a, :high]
+            if new.any():
+                sources = np.append(np.flatnonzero(members(reached_by[a])), a)
+                reach[sources, :high] |= new
+                targets = np.flatnonzero(members(new))
+                reached_by[targets, low:] |= (reached_by[a] | bit(a))[low:]
+
+        for start in range(0, n, 1024):
+            sources, targets = np.nonzero(members(attacks[start:start + 1024]))
+            self.AF.add_attacks(sources + start, targets)
+
+        self.AF.remove_arguments([arg_id for arg_id in self.AF.argument_ids() if arg_id not in connected])
+
+        leaves = self.AF.to_sparse().unattacked()
         print("Number of maximal arguments before: {}".format(len(leaves)))
 
-    def generate_alteroceptive_framework(self):
-        """
-        This function generates and populates an alteroceptive framework (forced bipartition) from an existing culture.
-        An alteroceptive framework is built with the following rules:
-        1. Every argument is represented by 4 nodes, black and white X hypothesis and verified.
-        2. Every attack between arguments is reconstructed between nodes of different colours.
-        :return: A flat black-and-white framework.
-        """
-        self.raw_alteroceptive_framework = ArgumentationFramework()
-        for argument in self.AF.arguments():
-            # Even indices for defender, odd for challenger.
-            # Adding hypothetical arguments.
-            black_hypothesis = PrivateArgument(arg_id = argument.id() * 4,
-                                               descriptive_text = argument.hypothesis_text,
-                                               privacy_cost = argument.privacy_cost)
-            white_hypothesis = PrivateArgument(arg_id = argument.id() * 4 + 1,
-                                               descriptive_text = argument.hypothesis_text,
-                                               privacy_cost = argument.privacy_cost)
-            h_verifier = argument.hypothesis_verifier if argument.hypothesis_verifier else always_true
-            black_hypothesis.set_verifier(h_verifier)
-            white_hypothesis.set_verifier(h_verifier)
-
-            # Adding verified arguments.
-            black_verified = PrivateArgument(arg_id=argument.id() * 4 + 2,
-                                             descriptive_text=argument.verified_fact_text,
-                                             privacy_cost=argument.privacy_cost)
-            white_verified = PrivateArgument(arg_id=argument.id() * 4 + 3,
-                                             descriptive_text=argument.verified_fact_text,
-                                             privacy_cost=argument.privacy_cost)
-            f_verifier = argument.fact_verifier if argument.fact_verifier else argument.verifier()
-            black_verified.set_verifier(f_verifier)
-            white_verified.set_verifier(f_verifier)
-
-            self.raw_alteroceptive_framework.add_arguments([black_hypothesis, white_hypothesis, black_verified, white_verified])
-
-            # Adding mutual attacks between contradictory hypotheses.
-            self.raw_alteroceptive_framework.add_attack(black_hypothesis.id(), white_hypothesis.id())
-            self.raw_alteroceptive_framework.add_attack(white_hypothesis.id(), black_hypothesis.id())
-
-            # Adding mutual attacks between contradictory verified arguments.
-            self.raw_alteroceptive_framework.add_attack(black_verified.id(), white_verified.id())
-            self.raw_alteroceptive_framework.add_attack(white_verified.id(), black_verified.id())
-
-            # Adding attacks between immediate verified and hypothetical arguments.
-            self.raw_alteroceptive_framework.add_attack(black_verified.id(), white_hypothesis.id())
-            self.raw_alteroceptive_framework.add_attack(white_verified.id(), black_hypothesis.id())
-
-        # Adding attacks between different arguments in original framework.
-        # Each hypothesis attacks both the attacked hypothesis and verified arguments.
-        for attacker_id, attacked_set in self.AF.attacks().items():
-            black_hypothesis_attacker_id = attacker_id * 4
-            white_hypothesis_attacker_id = attacker_id * 4 + 1
-
-            # Reproducing previous attacks, crossing between black and white nodes.
-            for attacked_id in attacked_set:
-                black_hypothesis_attacked_id = attacked_id * 4
-                white_hypothesis_attacked_id = attacked_id * 4 + 1
-                black_verified_attacked_id = attacked_id * 4 + 2
-                white_verified_attacked_id = attacked_id * 4 + 3
-                self.raw_alteroceptive_framework.add_attack(black_hypothesis_attacker_id, white_hypothesis_attacked_id)
-                self.raw_alteroceptive_framework.add_attack(black_hypothesis_attacker_id, white_verified_attacked_id)
-                self.raw_alteroceptive_framework.add_attack(white_hypothesis_attacker_id, black_hypothesis_attacked_id)
-                self.raw_alteroceptive_framework.add_attack(white_hypothesis_attacker_id, black_verified_attacked_id)
-
 
 
 
@@ -0,0 +1,302 @@
+"""
+Interchangeable solver backends sharing one interface: solve(framework, semantics, query) returns output
+formatted like mu-toksia's stdout.
+Backends are registered by name; "auto" picks one by framework size and semantics.
+"""
+import time
+
+import numpy as np
+
+import external_solver
+import native_solver
+
+# Enumeration problems on frameworks with at least this many arguments go to the external solver, if installed.
+EXTERNAL_MIN_ARGUMENTS = 2000
+# compare_backends checks frameworks up to this size against brute force when no external solver is installed.
+BRUTE_FORCE_MAX_ARGUMENTS = 16
+
+
+class SolverBackend:
+    """
+    Base class of solver backends.
+    """
+    name = None
+    # External solver command line used by solver pool workers, or None to solve in process.
+    command = None
+
+    def supports(self, semantics):
+        return True
+
+    def solve(self, framework, semantics, query=""):
+        """
+        :param framework: The framework to be solved.
+        :param semantics: ICCMA problem, e.g. "DS-PR" or "EE-PR".
+        :param query: The queried argument id, for DS/DC problems.
+        :return: stdout output of the solver (likely "YES" or "NO").
+        """
+        raise NotImplementedError
+
+
+class ExternalBackend(SolverBackend):
+    """
+    Runs an external ICCMA solver process (mu-toksia by default).
+    """
+    name = "mu-toksia"
+
+    def __init__(self, command=None):
+        self.command = command if command else external_solver.MU_TOKSIA
+
+    def available(self):
+        return external_solver.available(self.command)
+
+    def solve(self, framework, semantics, query=""):
+        return external_solver.run(framework.to_aspartix_id(), semantics, query, self.command)
+
+
+class NativeBackend(SolverBackend):
+    """
+    Solves in process with native_solver.
+    """
+    name = "native"
+
+    def supports(self, semantics):
+        return native_solver.supports(semantics)
+
+    def solve(self, framework, semantics, query=""):
+        return native_solver.solve(framework, semantics, query)
+
+
+class CachedBackend(SolverBackend):
+    """
+    Memoises another backend in a SolverCache.
+    """
+    name = "cached"
+
+    def __init__(self, backend, cache=None):
+        """
+        :param cache: A SolverCache, or None for the framework's shared cache (ArgumentationFramework.solver_cache),
+        the one run_solver already goes through. If that is disabled too, problems go straight to backend.
+        """
+        self.backend = backend
+        self.cache = cache
+        self.command = backend.command
+
+    def supports(self, semantics):
+        return self.backend.supports(semantics)
+
+    def solve(self, framework, semantics, query=""):
+        cache = self.cache if self.cache is not None else getattr(framework, "solver_cache", None)
+        if cache is None:
+            return self.backend.solve(framework, semantics, query)
+        return cache.solve(framework, semantics, query,
+                           lambda framework, sem, arg: self.backend.solve(framework, sem, arg))
+
+
+class BatchBackend(SolverBackend):
+    """
+    Decides acceptance with the batched grounded fixpoint of native_solver.batch_accepted.
+    Meant for many pruned copies of one framework (see solve_masks); single queries are a batch of one.
+    """
+    name = "batch"
+
+    def supports(self, semantics):
+        return semantics in ("DS-PR", "DC-PR", "DS-GR", "DC-GR")
+
+    def solve(self, framework, semantics, query=""):
+        masks = np.ones((1, len(framework.argument_ids())), dtype=bool)
+        return "YES\n" if self.solve_masks(framework, masks, semantics, query)[0] else "NO\n"
+
+    def solve_masks(self, framework, masks, semantics, query):
+        """
+        :param masks: Boolean matrix (copies x arguments), columns in framework.argument_ids() order.
+        :return: Boolean array with the answer for each copy.
+        """
+        mode, sem = semantics.split("-")
+        return native_solver.batch_accepted(framework, masks, int(query), semantics=sem, skeptical=mode == "DS")
+
+
+BACKENDS = {backend.name: backend for backend in (ExternalBackend(), NativeBackend(), BatchBackend(),
+                                                  CachedBackend(NativeBackend()))}
+
+
+def register(backend, name=None):
+    """
+    Makes a backend selectable by name, e.g. as ArgumentationFramework.solver_backend.
+    """
+    BACKENDS[name if name else backend.name] = backend
+
+
+def select(framework, semantics):
+    """
+    Picks a backend for a problem: the native solver unless it does not support the semantics, or the problem
+    is an enumeration over at least EXTERNAL_MIN_ARGUMENTS arguments and the external solver is installed.
+    """
+    native = BACKENDS["native"]
+    external = BACKENDS["mu-toksia"]
+    if not native.supports(semantics):
+        return external
+    if semantics.startswith("EE") and len(framework.argument_ids()) >= EXTERNAL_MIN_ARGUMENTS \
+            and external.available():
+        return external
+    return native
+
+
+def get(name, framework=None, semantics=None):
+    """
+    :param name: A registered backend name, or "auto".
+    :return: The backend to solve semantics on framework with. Backends that do not support the semantics are
+    replaced by the automatic choice.
+    """
+    if name != "auto":
+        if name not in BACKENDS:
+            raise ValueError("Unknown solver backend: {}".format(name))
+        backend = BACKENDS[name]
+        if semantics is None or backend.supports(semantics):
+            return backend
+    return select(framework, semantics)
+
+
+def normalise_output(output):
+    """
+    :return: Comparable form of a solver output: "YES"/"NO", or a set of extensions.
+    """
+    output = output.strip()
+    if output in ("YES", "NO"):
+        return output
+    return {frozenset(extension) for extension in native_solver.parse_extensions(output)}
+
+
+def brute_force_extensions(framework, semantics):
+    """
+    Enumerates the complete extensions of a small framework subset by subset, independently of native_solver.
+    :param semantics: "CO", "GR" or "PR".
+    :return: Set of frozensets of argument ids.
+    """
+    ids = list(framework.argument_ids())
+    bit = {arg_id: 1 << i for i, arg_id in enumerate(ids)}
+    attacks = [sum(bit[b] for b in framework.arguments_attacked_by(a) if b in bit) for a in ids]
+    attackers = [sum(bit[a] for j, a in enumerate(ids) if attacks[j] & bit[b]) for b in ids]
+    complete = []
+    for subset in range(1 << len(ids)):
+        attacked = 0
+        for i in range(len(ids)):
+            if subset >> i & 1:
+                attacked |= attacks[i]
+        defended = sum(1 << i for i in range(len(ids)) if attackers[i] & ~attacked == 0)
+        if subset & attacked == 0 and defended == subset:
+            complete.append(subset)
+    if semantics == "GR":
+        complete = [min(complete, key=lambda subset: bin(subset).count("1"))]
+    elif semantics == "PR":
+        complete = [subset for subset in complete if not any(subset != other and subset & other == subset
+                                                             for other in complete)]
+    return {frozenset(arg_id for arg_id in ids if subset & bit[arg_id]) for subset in complete}
+
+
+def grounded_extension(framework):
+    """
+    The least fixpoint of the characteristic function, computed naively, independently of native_solver.
+    :return: Set of argument ids.
+    """
+    ids = set(framework.argument_ids())
+    attackers = {b: set() for b in ids}
+    for a in ids:
+        for b in framework.arguments_attacked_by(a):
+            if b in ids:
+                attackers[b].add(a)
+    grounded = set()
+    while True:
+        attacked = {b for b in ids if attackers[b] & grounded}
+        defended = {a for a in ids if attackers[a] <= attacked}
+        if defended == grounded:
+            return grounded
+        grounded = defended
+
+
+def reference_output(framework, semantics, arg_str=""):
+    """
+    Normalised answer of a problem computed without native_solver: by brute force on small frameworks, otherwise
+    from the grounded extension when that settles it.
+    :return: As normalise_output, or None if no independent answer is available.
+    """
+    mode, sem = semantics.split("-")
+    if sem not in ("GR", "CO", "PR"):
+        return None
+    if len(framework.argument_ids()) <= BRUTE_FORCE_MAX_ARGUMENTS:
+        extensions = brute_force_extensions(framework, sem)
+        if mode == "EE":
+            return extensions
+        accepted = all if mode == "DS" else any
+        return "YES" if accepted(int(arg_str) in extension for extension in extensions) else "NO"
+    grounded = grounded_extension(framework)
+    if mode == "EE":
+        return {frozenset(grounded)} if sem == "GR" else None
+    x = int(arg_str)
+    if x in grounded:
+        return "YES"
+    if sem == "GR" or any(x in framework.arguments_attacked_by(a) for a in grounded):
+        # Arguments attacked by the grounded extension are in no complete extension.
+        return "NO"
+    return None
+
+
+def compare_backends(names=None, num_frameworks=5, problems=("DS-PR", "DC-PR", "DS-GR", "DC-GR", "EE-PR", "EE-GR"),
+                     query="1", num_args=None):
+    """
+    Conformance and speed harness. Solves the black-and-white frameworks of freshly generated RandomCultures with
+    every backend, checks their answers against a reference and times them.
+    The reference is the external solver if it is installed, otherwise reference_output (brute force on small
+    frameworks, see num_args). Answers without a reference are counted as unchecked.
+    Cached backends are given a private SolverCache, so the comparison neither reads nor fills the shared one.
+    :param names: Backend names. Defaults to all registered backends (the external one only if installed).
+    :param num_frameworks: Number of RandomCultures generated.
+    :param problems: ICCMA problems solved on each framework.
+    :param query: Argument queried by DS/DC problems.
+    :param num_args: Number of arguments of the generated cultures. Defaults to RandomCulture.num_args.
+    :return: Dict from backend name to {"calls", "mean_latency", "max_latency", "mismatches", "unchecked"}.
+    """
+    from argument import ArgumentationFrameworkView
+    from private_culture import RandomCulture
+    from solver_cache import SolverCache
+
+    if names is None:
+        names = [name for name, backend in BACKENDS.items()
+                 if not isinstance(backend, ExternalBackend) or backend.available()]
+    cache = SolverCache()
+    backends = {name: CachedBackend(BACKENDS[name].backend, cache) if isinstance(BACKENDS[name], CachedBackend)
+                else BACKENDS[name] for name in names}
+    external = BACKENDS.get("mu-toksia")
+    external = external if isinstance(external, ExternalBackend) and external.available() else None
+    culture = RandomCulture
+    if num_args is not None:
+        culture = type("RandomCulture", (RandomCulture,), {"num_args": num_args, "num_properties": num_args})
+    latencies = {name: [] for name in names}
+    mismatches = {name: 0 for name in names}
+    unchecked = {name: 0 for name in names}
+    for _ in range(num_frameworks):
+        framework = ArgumentationFrameworkView(culture().raw_alteroceptive_framework.freeze()).without([0, 2, 3])
+        for semantics in problems:
+            arg_str = "" if semantics.startswith("EE") else query
+            if external is not None:
+                reference = normalise_output(external.solve(framework, semantics, arg_str))
+            else:
+                reference = reference_output(framework, semantics, arg_str)
+            for name in names:
+                backend = backends[name]
+                if not backend.supports(semantics):
+                    continue
+                start = time.perf_counter()
+                output = normalise_output(backend.solve(framework, semantics, arg_str))
+                latencies[name].append(time.perf_counter() - start)
+                if reference is None:
+                    unchecked[name] += 1
+                elif output != reference:
+                    mismatches[name] += 1
+
+    report = {}
+    for name in names:
+        calls = latencies[name]
+        report[name] = {"calls": len(calls), "mean_latency": sum(calls) / len(calls) if calls else 0.0,
+                        "max_latency": max(calls, default=0.0), "mismatches": mismatches[name],
+                        "unchecked": unchecked[name]}
+    return report
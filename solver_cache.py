@@ -0,0 +1,93 @@
+"""
+Content-addressed memoisation of solver results.
+Results are keyed by a canonical hash of the framework (argument set and attack set), the semantics and the
+query argument, so equal frameworks built in different ways share the same entry.
+Enumeration (EE) problems are never cached: their outputs can be exponentially large.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def canonical_key(framework, semantics, arg_str=""):
+    """
+    :param framework: Any framework exposing argument_ids and arguments_attacked_by.
+    :return: Digest identifying the (framework, semantics, query) combination.
+    """
+    ids = sorted(framework.argument_ids())
+    id_set = set(ids)
+    attacks = sorted((a, b) for a in ids for b in framework.arguments_attacked_by(a) if b in id_set)
+    content = repr((ids, attacks, semantics, str(arg_str)))
+    return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+
+class SolverCache:
+    """
+    LRU cache of solver outputs with hit/miss counters. Safe to share between threads.
+    """
+    def __init__(self, max_size=4096, max_bytes=16 * 1024 * 1024):
+        """
+        :param max_size: Maximum number of results kept. The least recently used one is evicted first.
+        :param max_bytes: Maximum total length of the cached outputs. Larger outputs are not cached at all.
+        """
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.num_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.num_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def get(self, key):
+        """
+        :return: The cached output, or None on a miss.
+        """
+        with self.lock:
+            output = self.entries.get(key)
+            if output is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return output
+
+    def put(self, key, output):
+        if len(output) > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.num_bytes -= len(previous)
+            self.entries[key] = output
+            self.num_bytes += len(output)
+            while len(self.entries) > self.max_size or self.num_bytes > self.max_bytes:
+                self.num_bytes -= len(self.entries.popitem(last=False)[1])
+
+    def solve(self, framework, semantics, arg_str, solver):
+        """
+        Returns the cached output for this query, calling solver(framework, semantics, arg_str) on a miss.
+        EE problems go straight to the solver.
+        """
+        if semantics.startswith("EE"):
+            return solver(framework, semantics, arg_str)
+        key = canonical_key(framework, semantics, arg_str)
+        output = self.get(key)
+        if output is None:
+            output = solver(framework, semantics, arg_str)
+            self.put(key, output)
+        return output
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"size": len(self.entries), "bytes": self.num_bytes, "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0}
@@ -0,0 +1,267 @@
+"""
+A fixed pool of long-lived solver worker processes.
+Frameworks are sent to the workers over pipes as compact integer arrays and results are streamed back as they
+arrive, so neither process startup nor the filesystem is paid per request.
+Each worker either runs the native solver in process (the default) or wraps an external solver command line
+such as mu-toksia.
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+import numpy as np
+
+import external_solver
+import native_solver
+
+
+class EncodedFramework:
+    """
+    Compact, picklable form of a framework: argument ids plus attacks as pairs of dense indices.
+    Only supports the queries needed by the solvers.
+    """
+    def __init__(self, ids, sources, targets):
+        self.ids = ids
+        self.sources = sources
+        self.targets = targets
+
+    @classmethod
+    def encode(cls, framework):
+        ids, _, _, attacked = native_solver.dense_graph(framework)
+        sources = np.repeat(np.arange(len(ids), dtype=np.int32), [len(targets) for targets in attacked])
+        targets = np.fromiter((j for targets in attacked for j in targets), dtype=np.int32, count=len(sources))
+        return cls(np.asarray(ids, dtype=np.int64), sources, targets)
+
+    def dense_graph(self):
+        ids = self.ids.tolist()
+        index = {arg_id: i for i, arg_id in enumerate(ids)}
+        attackers = [[] for _ in ids]
+        attacked = [[] for _ in ids]
+        for a, b in zip(self.sources.tolist(), self.targets.tolist()):
+            attackers[b].append(a)
+            attacked[a].append(b)
+        return ids, index, attackers, attacked
+
+    def restrict(self, kept):
+        """
+        :param kept: Sorted list of dense indices to keep.
+        :return: The EncodedFramework induced by the kept arguments.
+        """
+        remap = np.full(len(self.ids), -1, dtype=np.int32)
+        remap[kept] = np.arange(len(kept), dtype=np.int32)
+        keep = (remap[self.sources] >= 0) & (remap[self.targets] >= 0)
+        return EncodedFramework(self.ids[kept], remap[self.sources[keep]], remap[self.targets[keep]])
+
+    def to_aspartix_id(self):
+        lines = ["arg({}).\n".format(arg_id) for arg_id in self.ids.tolist()]
+        lines.extend("att({},{}).\n".format(self.ids[a], self.ids[b])
+                     for a, b in zip(self.sources.tolist(), self.targets.tolist()))
+        return "".join(lines)
+
+
+def solve_encoded(framework, semantics, arg_str, command=None):
+    """
+    Solves one request inside a worker.
+    :param framework: An EncodedFramework.
+    :param command: External solver command line (e.g. external_solver.MU_TOKSIA), or None for the native solver.
+    :return: stdout output of the solver.
+    """
+    if native_solver.kernel_applies(semantics, arg_str):
+        _, index, attackers, attacked = framework.dense_graph()
+        if int(arg_str) not in index:
+            return "NO\n"
+        kept, _ = native_solver.kernel_dense(attackers, attacked, index[int(arg_str)])
+        framework = framework.restrict(kept)
+    answer = native_solver.well_founded_answer(framework, semantics, arg_str)
+    if answer is not None:
+        return answer
+    if command is None:
+        return native_solver.solve(framework, semantics, arg_str)
+    return external_solver.run(framework.to_aspartix_id(), semantics, arg_str, command)
+
+
+def worker_main(conn, command):
+    """
+    Worker loop. Requests are (request_id, framework, semantics, arg_str) tuples and responses are
+    (request_id, output, error, fast_path_counts) tuples, the counts being those of that request alone.
+    A None request shuts the worker down.
+    """
+    if hasattr(os, "setsid"):
+        # Lead a process group of our own, so killing the group also kills any external solver we started.
+        os.setsid()
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        request_id, framework, semantics, arg_str = request
+        native_solver.reset_fast_path_counts()
+        try:
+            output, error = solve_encoded(framework, semantics, arg_str, command), None
+        except Exception as e:
+            output, error = None, str(e)
+        conn.send((request_id, output, error, dict(native_solver.fast_path_counts)))
+
+
+class SolverWorker:
+    """
+    Parent-side handle of a worker process, with the requests it has been sent and not yet answered.
+    """
+    def __init__(self, command):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=worker_main, args=(child_conn, command), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.pending = deque()
+        # Time at which the request at the head of the queue started being solved.
+        self.started = None
+
+    def send(self, request):
+        if not self.pending:
+            self.started = time.monotonic()
+        self.pending.append(request)
+        self.conn.send(request)
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill_group()
+            self.process.join()
+        self.conn.close()
+
+    def kill(self):
+        self.kill_group()
+        self.process.join()
+        self.conn.close()
+
+    def kill_group(self):
+        """
+        Kills the worker together with the external solver it may be running.
+        """
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                return
+            except ProcessLookupError:
+                # The worker has not called setsid yet, so it has no children either.
+                pass
+        self.process.kill()
+
+
+class SolverPool:
+    """
+    Fixed-size pool of solver workers. Use as a context manager:
+        with SolverPool() as pool:
+            for key, output in pool.imap_unordered(requests):
+                ...
+    """
+    def __init__(self, num_workers=None, command=None, queue_depth=2, timeout=None):
+        """
+        :param num_workers: Number of worker processes. Defaults to the number of CPUs.
+        :param command: External solver command line, or None to solve with the native solver.
+        :param queue_depth: Maximum number of unanswered requests per worker.
+        :param timeout: Seconds a single request may take before its worker is restarted. None disables it.
+        """
+        self.num_workers = num_workers if num_workers else os.cpu_count()
+        self.command = command
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self.workers = []
+        self.restarts = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        while len(self.workers) < self.num_workers:
+            self.workers.append(SolverWorker(self.command))
+
+    def close(self):
+        for worker in self.workers:
+            worker.stop()
+        self.workers = []
+
+    def restart(self, worker):
+        """
+        Replaces a crashed or timed out worker. Its head request is failed and the rest are resent.
+        :return: The failed request.
+        """
+        worker.kill()
+        self.restarts += 1
+        replacement = SolverWorker(self.command)
+        self.workers[self.workers.index(worker)] = replacement
+        failed = worker.pending.popleft()
+        for request in worker.pending:
+            replacement.send(request)
+        return failed
+
+    def imap_unordered(self, requests):
+        """
+        Solves a stream of requests, yielding results in completion order.
+        Requests are only pulled from the iterable when a worker has room, so memory stays bounded.
+        :param requests: Iterable of (key, framework, semantics, arg_str).
+        :return: Generator of (key, output), where output is None if the request failed or timed out.
+        """
+        self.start()
+        requests = iter(requests)
+        keys = {}
+        next_id = 0
+        exhausted = False
+        while True:
+            # Fill the emptiest workers first.
+            while not exhausted:
+                worker = min(self.workers, key=lambda w: len(w.pending))
+                if len(worker.pending) >= self.queue_depth:
+                    break
+                try:
+                    key, framework, semantics, arg_str = next(requests)
+                except StopIteration:
+                    exhausted = True
+                    break
+                keys[next_id] = key
+                worker.send((next_id, EncodedFramework.encode(framework), semantics, arg_str))
+                next_id += 1
+            busy = [worker for worker in self.workers if worker.pending]
+            if not busy:
+                return
+
+            wait_time = None
+            if self.timeout is not None:
+                deadline = min(worker.started for worker in busy) + self.timeout
+                wait_time = max(0.0, deadline - time.monotonic())
+            ready = wait([worker.conn for worker in busy], timeout=wait_time)
+
+            for worker in busy:
+                if worker.conn not in ready:
+                    if self.timeout is not None and time.monotonic() - worker.started > self.timeout:
+                        request_id = self.restart(worker)[0]
+                        logging.error("SolverPool: request {} timed out".format(keys[request_id]))
+                        yield keys.pop(request_id), None
+                    continue
+                try:
+                    request_id, output, error, fast_path_counts = worker.conn.recv()
+                except (EOFError, OSError):
+                    request_id = self.restart(worker)[0]
+                    logging.error("SolverPool: worker crashed while solving {}".format(keys[request_id]))
+                    yield keys.pop(request_id), None
+                    continue
+                worker.pending.popleft()
+                worker.started = time.monotonic()
+                native_solver.add_fast_path_counts(fast_path_counts)
+                if error is not None:
+                    logging.error("SolverPool: request {} failed: {}".format(keys[request_id], error))
+                yield keys.pop(request_id), output
@@ -0,0 +1,103 @@
+"""
+scipy.sparse adapter for the attack graph of a framework, so graph analytics run in compiled code
+(scipy.sparse.csgraph) rather than Python loops over dicts of sets.
+"""
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse import csgraph
+
+import native_solver
+
+
+class SparseGraph:
+    """
+    Read-only CSR adjacency matrix of a framework: matrix[i, j] is set if argument ids[i] attacks ids[j].
+    Row and column order is framework.argument_ids().
+    """
+    def __init__(self, framework):
+        if hasattr(framework, "attacks_indptr"):
+            # Frozen frameworks already keep their attacks in CSR form.
+            ids, indptr, indices = list(framework.ids), framework.attacks_indptr, framework.attacks_indices
+        else:
+            ids, _, _, attacked = native_solver.dense_graph(framework)
+            indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(targets) for targets in attacked])
+            indices = np.fromiter((j for targets in attacked for j in targets), dtype=np.int32, count=int(indptr[-1]))
+        self.ids = ids
+        self.index = {arg_id: i for i, arg_id in enumerate(ids)}
+        self.matrix = csr_matrix((np.ones(len(indices), dtype=bool), indices, indptr), shape=(len(ids), len(ids)))
+        self.transposed = self.matrix.T.tocsr()
+
+    def ids_of(self, indices):
+        """
+        :return: List of argument ids at the given matrix indices.
+        """
+        return [self.ids[i] for i in np.asarray(indices).tolist()]
+
+    def indices_of(self, argument_ids):
+        """
+        :return: Array of matrix indices of the given argument ids.
+        """
+        return np.fromiter((self.index[arg_id] for arg_id in argument_ids), dtype=np.int64)
+
+    def in_degrees(self):
+        """
+        :return: Number of attackers of each argument.
+        """
+        return np.diff(self.transposed.indptr)
+
+    def out_degrees(self):
+        """
+        :return: Number of arguments attacked by each argument.
+        """
+        return np.diff(self.matrix.indptr)
+
+    def unattacked(self):
+        """
+        :return: List of ids of the arguments nobody attacks.
+        """
+        return self.ids_of(np.flatnonzero(self.in_degrees() == 0))
+
+    def reachable(self, argument_ids, reverse=False):
+        """
+        :param argument_ids: Arguments the search starts from. They are part of the result.
+        :param reverse: Follow attacks backwards, i.e. find the (indirect) attackers instead.
+        :return: List of ids of the arguments reachable through attacks, in index order.
+        """
+        step = self.matrix if reverse else self.transposed
+        visited = np.zeros(len(self.ids), dtype=bool)
+        visited[self.indices_of(argument_ids)] = True
+        frontier = visited.copy()
+        while frontier.any():
+            frontier = (step @ frontier) & ~visited
+            visited |= frontier
+        return self.ids_of(np.flatnonzero(visited))
+
+    def strongly_connected_components(self):
+        """
+        :return: List of components, each a list of argument ids.
+        """
+        num_components, labels = csgraph.connected_components(self.matrix, directed=True, connection="strong")
+        order = np.argsort(labels, kind="stable")
+        bounds = np.cumsum(np.bincount(labels, minlength=num_components))[:-1]
+        return [self.ids_of(component) for component in np.split(order, bounds)]
+
+    def transitive_closure(self):
+        """
+        :return: Boolean CSR matrix whose [i, j] entry is set if ids[i] attacks ids[j] through a path of one or more
+        attacks.
+        """
+        n = len(self.ids)
+        _, labels = csgraph.connected_components(self.matrix, directed=True, connection="strong")
+        # An argument reaches itself if it attacks itself or lies on a cycle.
+        on_cycle = (np.bincount(labels, minlength=n)[labels] > 1) | self.matrix.diagonal()
+        rows = []
+        for i in range(n):
+            reached = csgraph.breadth_first_order(self.matrix, i, directed=True, return_predecessors=False)
+            rows.append(reached if on_cycle[i] else reached[1:])
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row) for row in rows])
+        indices = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32)
+        closure = csr_matrix((np.ones(len(indices), dtype=bool), indices, indptr), shape=(n, n))
+        closure.sort_indices()
+        return closure
@@ -0,0 +1,118 @@
+"""
+Checks the lazy AlteroceptiveFramework, its frozen copies and the culture's memo of pruned frameworks against the
+node-by-node alteroceptive framework the cultures used to build.
+"""
+import copy
+import random
+
+import numpy as np
+import pytest
+
+from agent_queue import AgentQueue, ArgStrategy
+from argument import ArgumentationFramework, PrivateArgument
+from base_culture import AlteroceptiveFramework, Culture, FrozenAlteroceptiveFramework, always_true
+from private_culture import RandomCulture
+
+
+class SmallCulture(RandomCulture):
+    num_args = 12
+    num_properties = 12
+
+
+def reference_framework(culture):
+    """
+    :return: The alteroceptive framework of a culture as a mutable ArgumentationFramework, built node by node.
+    """
+    framework = ArgumentationFramework()
+    for argument in culture.AF.arguments():
+        h_verifier = argument.hypothesis_verifier if argument.hypothesis_verifier else always_true
+        f_verifier = argument.fact_verifier if argument.fact_verifier else argument.verifier()
+        for k, text, verifier in [(0, argument.hypothesis_text, h_verifier), (1, argument.hypothesis_text, h_verifier),
+                                  (2, argument.verified_fact_text, f_verifier),
+                                  (3, argument.verified_fact_text, f_verifier)]:
+            node = PrivateArgument(arg_id=argument.id() * 4 + k, descriptive_text=text,
+                                   privacy_cost=argument.privacy_cost)
+            node.set_verifier(verifier)
+            framework.add_argument(node)
+        x = argument.id() * 4
+        for source, target in [(0, 1), (1, 0), (2, 3), (3, 2), (2, 1), (3, 0)]:
+            framework.add_attack(x + source, x + target)
+    for attacker_id, attacked_set in culture.AF.attacks().items():
+        for attacked_id in attacked_set:
+            for source, target in [(0, 1), (0, 3), (1, 0), (1, 2)]:
+                framework.add_attack(attacker_id * 4 + source, attacked_id * 4 + target)
+    return framework
+
+
+def assert_same_framework(framework, expected):
+    ids = list(expected.argument_ids())
+    assert list(framework.argument_ids()) == ids
+    for arg_id in ids:
+        assert framework.arguments_that_attack(arg_id) == expected.arguments_that_attack(arg_id)
+        assert framework.arguments_attacked_by(arg_id) == expected.arguments_attacked_by(arg_id)
+        node, expected_node = framework.argument(arg_id), expected.argument(arg_id)
+        assert node.privacy_cost == expected_node.privacy_cost
+        assert node.descriptive_text == expected_node.descriptive_text
+        assert node.verifier() is expected_node.verifier()
+    for rank in ("least_attacked_rank", "strongest_attacker_rank"):
+        assert sorted(ids, key=getattr(framework, rank)) == sorted(ids, key=getattr(expected, rank))
+
+
+@pytest.fixture(params=range(3))
+def culture(request):
+    random.seed(request.param)
+    return SmallCulture()
+
+
+def test_lazy_framework_matches_reference(culture):
+    lazy = culture.raw_alteroceptive_framework
+    assert isinstance(lazy, AlteroceptiveFramework)
+    assert_same_framework(lazy, reference_framework(culture))
+    assert lazy.argument(lazy.argument_ids()[5]) is lazy.argument(lazy.argument_ids()[5])
+    with pytest.raises(KeyError):
+        lazy.argument(4 * SmallCulture.num_args)
+    with pytest.raises(TypeError):
+        lazy.add_attack(0, 1)
+
+
+def test_pruned_and_frozen_frameworks_match_reference(culture):
+    lazy = culture.raw_alteroceptive_framework
+    rng = random.Random(0)
+    for removed in ([], [0, 2, 3], rng.sample(lazy.argument_ids(), 10)):
+        expected = reference_framework(culture)
+        expected.remove_arguments(removed)
+        pruned = lazy.without(removed)
+        assert_same_framework(pruned, expected)
+        frozen = pruned.freeze()
+        assert isinstance(frozen, FrozenAlteroceptiveFramework)
+        assert_same_framework(frozen, expected)
+        assert frozen.privacy_costs.tolist() == [expected.argument(arg_id).privacy_cost for arg_id in frozen.ids]
+    # Pruning leaves the framework it was derived from untouched.
+    assert_same_framework(lazy, reference_framework(culture))
+
+
+def test_frozen_frameworks_are_memoised(culture):
+    frozen = culture.frozen_alteroceptive_framework([0, 2, 3])
+    assert culture.frozen_alteroceptive_framework((3, 2, 0)) is frozen
+    assert culture.frozen_alteroceptive_framework() is not frozen
+    # Copies start without the memo, and regenerating the framework drops it.
+    copied = copy.deepcopy(culture)
+    assert copied.frozen_alteroceptive_frameworks == {}
+    assert copied.frozen_alteroceptive_framework([0, 2, 3]).ids == frozen.ids
+    culture.generate_alteroceptive_framework()
+    assert culture.frozen_alteroceptive_framework([0, 2, 3]) is not frozen
+
+
+def test_ground_truth_does_not_depend_on_laziness():
+    results = []
+    for lazy in (True, False):
+        Culture.lazy_alteroceptive_framework = lazy
+        try:
+            random.seed(0)
+            queue = AgentQueue(ArgStrategy.LEAST_COST_PRIVATE, culture=SmallCulture(), size=5)
+            framework = queue.create_alteroceptive_framework()
+            results.append((framework.ids, framework.attacks_indptr.tolist(), framework.attacks_indices.tolist(),
+                            np.asarray(queue.compute_ground_truth_matrix()).tolist()))
+        finally:
+            Culture.lazy_alteroceptive_framework = True
+    assert results[0] == results[1]
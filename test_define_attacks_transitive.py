@@ -0,0 +1,71 @@
+"""
+Checks the bitset define_attacks_transitive against the breadth-first replication it replaced, on the same random
+draws.
+"""
+import random
+
+import pytest
+
+from argument import Argument, ArgumentationFramework
+from base_culture import Culture
+from private_culture import RandomCulture
+
+
+class SmallCulture(RandomCulture):
+    def __init__(self, num_args):
+        Culture.__init__(self)
+        self.num_args = num_args
+        self.create_arguments()
+
+
+def reference_attacks(culture):
+    """
+    The breadth-first define_attacks_transitive, drawing b from the connected arguments in the order they joined.
+    :return: Tuple (argument ids, set of attacks).
+    """
+    framework = ArgumentationFramework()
+    framework.add_arguments([Argument(arg_id, str(arg_id)) for arg_id in culture.AF.argument_ids()])
+    connected = [0]
+    for _ in range(culture.num_args * 8):
+        a = b = 0
+        while a == b:
+            a = random.randint(1, culture.num_args - 1)
+            b = random.choice(connected)
+            if b in framework.arguments_that_attack(a) or b > a:
+                a = b = 0
+                continue
+        framework.add_attack(a, b)
+        for arg_id in (a, b):
+            if arg_id not in connected:
+                connected.append(arg_id)
+        to_visit = set(framework.arguments_attacked_by(b))
+        visited = set()
+        while to_visit:
+            current = to_visit.pop()
+            if current in visited or current in framework.arguments_that_attack(a):
+                continue
+            if a > current:
+                framework.add_attack(a, current)
+            to_visit.update(framework.arguments_attacked_by(current))
+            visited.add(current)
+    framework.remove_arguments([arg_id for arg_id in framework.argument_ids() if arg_id not in connected])
+    ids = sorted(framework.argument_ids())
+    return ids, {(a, b) for a in ids for b in framework.arguments_attacked_by(a)}
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("num_args", [2, 10, 50, 64, 65, 150])
+def test_matches_breadth_first_replication(seed, num_args):
+    random.seed(seed)
+    culture = SmallCulture(num_args)
+    state = random.getstate()
+    expected_ids, expected_attacks = reference_attacks(culture)
+    random.setstate(state)
+    culture.define_attacks_transitive()
+
+    ids = sorted(culture.AF.argument_ids())
+    attacks = {(a, b) for a in ids for b in culture.AF.arguments_attacked_by(a)}
+    assert ids == expected_ids
+    assert attacks == expected_attacks
+    # Attacks only go from higher to lower ids.
+    assert all(a > b for a, b in attacks)
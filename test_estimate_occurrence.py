@@ -0,0 +1,66 @@
+"""
+Checks native_solver.estimate_occurrence against the exact fraction of brute-force preferred extensions containing
+each argument.
+"""
+import random
+
+import numpy as np
+import pytest
+
+import native_solver
+from argument import Argument, ArgumentationFramework
+from test_native_solver import brute_force_extensions, graph, random_framework
+
+SEEDS = range(20)
+
+
+def exact_occurrence(framework):
+    ids, attacks = graph(framework)
+    extensions = brute_force_extensions(ids, attacks, "PR")
+    return np.array([sum(arg_id in extension for extension in extensions) / len(extensions) for arg_id in ids])
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_estimate_matches_exact_occurrence(seed):
+    framework = random_framework(random.Random(seed), max_arguments=8)
+    expected = exact_occurrence(framework)
+    frequencies, half_width, num_samples = native_solver.estimate_occurrence(framework, error=0.02,
+                                                                             max_samples=20000, seed=seed)
+    assert num_samples <= 20000
+    assert np.allclose(frequencies, expected, atol=max(3 * half_width, 1e-9))
+    assert np.allclose(frequencies, expected, atol=0.06)
+
+
+def test_uneven_components_are_weighted_per_extension():
+    # {5, 6, 7} has two local extensions when 3 is in and one when 4 is in, so 3 is in 2 of the 3 extensions of
+    # {3, ..., 7}. A uniform choice per component, unweighted, would put it in half of the samples.
+    framework = ArgumentationFramework()
+    for arg_id in range(1, 8):
+        framework.add_argument(Argument(arg_id, str(arg_id)))
+    for attacker, attacked in [(1, 2), (2, 1), (3, 4), (4, 3), (4, 5), (5, 6), (6, 5), (5, 7), (7, 5)]:
+        framework.add_attack(attacker, attacked)
+    expected = exact_occurrence(framework)
+    frequencies, _, _ = native_solver.estimate_occurrence(framework, error=0.01, max_samples=100000, seed=0)
+    assert np.allclose(frequencies, expected, atol=0.03)
+
+
+def test_total_grounded_labelling_is_exact():
+    framework = ArgumentationFramework()
+    for arg_id in range(1, 4):
+        framework.add_argument(Argument(arg_id, str(arg_id)))
+    framework.add_attack(1, 2)
+    framework.add_attack(2, 3)
+    frequencies, half_width, num_samples = native_solver.estimate_occurrence(framework)
+    assert frequencies.tolist() == [1.0, 0.0, 1.0]
+    assert (half_width, num_samples) == (0.0, 0)
+
+
+def test_sampled_argument_strength():
+    framework = random_framework(random.Random(3), max_arguments=8)
+    expected = dict(zip(framework.argument_ids(), exact_occurrence(framework).tolist()))
+    random.seed(0)
+    framework.compute_rank_arguments_occurrence(error=0.02)
+    assert framework.argument_strength.keys() == expected.keys()
+    assert all(abs(framework.argument_strength[arg_id] - expected[arg_id]) <= 0.06 for arg_id in expected)
+    with pytest.raises(ValueError):
+        framework.compute_rank_arguments_occurrence(semantics="EE-CO", error=0.02)
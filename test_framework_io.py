@@ -0,0 +1,73 @@
+"""
+Round-trips random frameworks through the ASPARTIX and NumPy binary formats.
+"""
+import io
+import random
+
+import numpy as np
+import pytest
+
+import framework_io
+from argument import Argument, ArgumentationFramework, PrivateArgument
+from test_native_solver import random_framework
+
+SEEDS = range(20)
+
+
+def attack_set(framework):
+    return {(a, b) for a in framework.argument_ids() for b in framework.arguments_attacked_by(a)}
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_aspartix_round_trip(seed):
+    framework = random_framework(random.Random(seed), max_arguments=12)
+    file = io.StringIO()
+    framework_io.write_aspartix(framework, file)
+    assert file.getvalue() == framework.to_aspartix_id()
+
+    file.seek(0)
+    items = list(framework_io.read_aspartix(file))
+    assert [item[1] for item in items if item[0] == "arg"] == list(framework.argument_ids())
+    assert {item[1:] for item in items if item[0] == "att"} == attack_set(framework)
+    assert len([item for item in items if item[0] == "att"]) == len(attack_set(framework))
+
+
+def test_read_aspartix_is_lazy_and_tolerant():
+    lines = iter(["arg(1).\n", "arg( 2 ). att(1, 2).\n", "% comment\n", "att(2,1).\n"])
+    items = framework_io.read_aspartix(lines)
+    assert next(items) == ("arg", 1)
+    # Only the lines needed so far have been consumed.
+    assert next(lines) == "arg( 2 ). att(1, 2).\n"
+    assert list(items) == [("att", 2, 1)]
+
+    items = framework_io.read_aspartix(["arg(a).", "att(a,b)."], id_type=str)
+    assert list(items) == [("arg", "a"), ("att", "a", "b")]
+
+
+def test_descriptive_aspartix():
+    framework = ArgumentationFramework()
+    framework.add_argument(Argument(1, "rain"))
+    framework.add_argument(Argument(2, "sun"))
+    framework.add_attack(1, 2)
+    assert framework.to_aspartix_text() == "arg(rain).\narg(sun).\natt(rain,sun).\n"
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("mmap_mode", ["r", None])
+def test_binary_round_trip(seed, mmap_mode, tmp_path):
+    rng = random.Random(seed)
+    framework = ArgumentationFramework()
+    for argument in random_framework(rng, max_arguments=12).arguments():
+        framework.add_argument(PrivateArgument(argument.id(), privacy_cost=rng.randint(0, 20)))
+    for _ in range(rng.randint(0, 30)):
+        framework.add_attack(*rng.sample(list(framework.argument_ids()) * 2, 2))
+
+    framework_io.save_binary(framework, tmp_path / "framework")
+    arrays = framework_io.load_binary(tmp_path / "framework", mmap_mode=mmap_mode)
+    assert all(isinstance(array, np.memmap) == (mmap_mode is not None) for array in arrays)
+
+    loaded = ArgumentationFramework.from_arrays(*arrays)
+    assert sorted(loaded.argument_ids()) == sorted(framework.argument_ids())
+    assert attack_set(loaded) == attack_set(framework)
+    for argument in framework.arguments():
+        assert loaded.argument(argument.id()).privacy_cost == argument.privacy_cost
@@ -0,0 +1,99 @@
+"""
+Checks AgentQueue.interact_pair against a straightforward set-based dialogue on the same culture, agents and random
+draws, for every strategy.
+"""
+import random
+
+import pytest
+
+from agent_queue import AgentQueue, ArgStrategy
+from boat_culture import BoatCulture
+from private_culture import RandomCulture
+
+STRATEGIES = [strategy for strategy in ArgStrategy if strategy != ArgStrategy.COUNT_OCCURRENCES_ADMISSIBLE_RELATIVE]
+PRIVATE_STRATEGIES = {ArgStrategy.RANDOM_CHOICE_PRIVATE, ArgStrategy.LEAST_COST_PRIVATE,
+                      ArgStrategy.LEAST_ATTACKERS_PRIVATE, ArgStrategy.MOST_ATTACKS_PRIVATE}
+
+
+class SmallCulture(RandomCulture):
+    num_args = 16
+    num_properties = 16
+
+
+def reference_dialogue(framework, strategy, defender, challenger):
+    """
+    The dialogue game of interact_pair on plain sets of argument ids. Candidates are taken in framework order, the
+    cheapest (resp. least attacked, most attacking) first in that order on ties.
+    :return: Same tuple as interact_pair.
+    """
+    order = {arg_id: i for i, arg_id in enumerate(framework.argument_ids())}
+    cost = lambda arg_id: framework.argument(arg_id).privacy_cost
+    used = {defender: [], challenger: [1]}
+    last = {defender: [], challenger: [1]}
+    budget = {defender: defender.max_privacy_budget, challenger: challenger.max_privacy_budget}
+    private = strategy in PRIVATE_STRATEGIES
+    turn = 1
+    unfair = False
+    while True:
+        player, opponent = (defender, challenger) if turn % 2 else (challenger, defender)
+        all_used = used[player] + used[opponent]
+        forbidden = set(all_used).union(*(framework.arguments_attacked_by(arg_id) for arg_id in all_used))
+        attackers = set().union(*(framework.arguments_that_attack(arg_id) for arg_id in last[opponent]))
+        colour = 0 if player is defender else 1
+        candidates = sorted((arg_id for arg_id in attackers - forbidden if arg_id % 2 == colour), key=order.get)
+        verified = [arg_id for arg_id in candidates if framework.argument(arg_id).verify(player, opponent)]
+        if not verified:
+            winner = opponent
+            break
+        if strategy == ArgStrategy.ALL_ARGS:
+            attacked = set().union(*(framework.arguments_attacked_by(arg_id) for arg_id in verified))
+            if not set(last[opponent]) <= attacked:
+                winner = opponent
+                break
+            used[player].extend(verified)
+            last[player] = verified
+            turn += 1
+            continue
+        choices = [arg_id for arg_id in verified if cost(arg_id) <= budget[player]] if private else verified
+        if not choices:
+            winner = opponent
+            unfair = True
+            break
+        if strategy in (ArgStrategy.RANDOM_CHOICE_PRIVATE, ArgStrategy.RANDOM_CHOICE_NO_PRIVACY):
+            choice = random.choice(choices)
+        elif strategy in (ArgStrategy.LEAST_COST_PRIVATE, ArgStrategy.LEAST_COST_NO_PRIVACY):
+            choice = min(choices, key=lambda arg_id: (cost(arg_id), order[arg_id]))
+        elif strategy in (ArgStrategy.LEAST_ATTACKERS_PRIVATE, ArgStrategy.LEAST_ATTACKERS_NO_PRIVACY):
+            choice = min(choices, key=lambda arg_id: (len(framework.arguments_that_attack(arg_id)), order[arg_id]))
+        else:
+            choice = min(choices, key=lambda arg_id: (-len(framework.arguments_attacked_by(arg_id)), order[arg_id]))
+        last[player] = [choice]
+        used[player].append(choice)
+        if private:
+            budget[player] -= cost(choice)
+        turn += 1
+    total_privacy_cost = sum(agent.max_privacy_budget - budget[agent] for agent in (defender, challenger))
+    return winner is defender, unfair, total_privacy_cost
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("strategy", STRATEGIES, ids=lambda strategy: strategy.name)
+@pytest.mark.parametrize("culture_type", [SmallCulture, BoatCulture], ids=lambda culture_type: culture_type.__name__)
+@pytest.mark.parametrize("privacy_budget", [10, 40])
+def test_interact_pair_matches_reference(seed, strategy, culture_type, privacy_budget):
+    random.seed(seed)
+    queue = AgentQueue(strategy, culture=culture_type(), size=6, privacy_budget=privacy_budget)
+    queue.alteroceptive_framework = queue.create_alteroceptive_framework()
+    outcomes = set()
+    for defender in queue.queue:
+        for challenger in queue.queue:
+            if defender is challenger:
+                continue
+            state = random.getstate()
+            expected = reference_dialogue(queue.alteroceptive_framework, strategy, defender, challenger)
+            random.setstate(state)
+            assert queue.interact_pair(defender, challenger) == expected
+            outcomes.add(expected[0])
+    # Both sides win some dialogues, so the comparison covers more than the opening move. Under ALL_ARGS the
+    # defender of a small random culture can win every dialogue.
+    assert len(outcomes) == 2 or strategy == ArgStrategy.ALL_ARGS
@@ -0,0 +1,105 @@
+"""
+Cross-checks the in-process solver against brute force enumeration on random small frameworks.
+"""
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+import native_solver
+from argument import Argument, ArgumentationFramework
+
+SEEDS = range(40)
+
+
+def random_framework(rng, max_arguments=7):
+    """
+    :return: A framework with sparse ids, random attacks and possibly self-attacks.
+    """
+    framework = ArgumentationFramework()
+    ids = rng.sample(range(30), rng.randint(1, max_arguments))
+    for arg_id in ids:
+        framework.add_argument(Argument(arg_id, str(arg_id)))
+    for _ in range(rng.randint(0, 2 * len(ids))):
+        framework.add_attack(rng.choice(ids), rng.choice(ids))
+    return framework
+
+
+def brute_force_extensions(ids, attacks, semantics):
+    """
+    :param ids: Argument ids.
+    :param attacks: Set of (attacker, attacked) pairs between ids.
+    :param semantics: "GR", "CO" or "PR".
+    :return: List of extensions, as frozensets.
+    """
+    attackers = {b: {a for a, c in attacks if c == b} for b in ids}
+
+    def defended(subset):
+        return {b for b in ids if all(attackers[a] & subset for a in attackers[b])}
+
+    complete = []
+    for size in range(len(ids) + 1):
+        for subset in map(frozenset, itertools.combinations(ids, size)):
+            conflict_free = not any((a, b) in attacks for a in subset for b in subset)
+            if conflict_free and defended(subset) == subset:
+                complete.append(subset)
+    if semantics == "CO":
+        return complete
+    if semantics == "GR":
+        return [min(complete, key=len)]
+    return [s for s in complete if not any(s < t for t in complete)]
+
+
+def graph(framework):
+    ids = list(framework.argument_ids())
+    attacks = {(a, b) for a in ids for b in framework.arguments_attacked_by(a)}
+    return ids, attacks
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("semantics", ["GR", "CO", "PR"])
+def test_solve_matches_brute_force(seed, semantics):
+    rng = random.Random(seed)
+    framework = random_framework(rng)
+    ids, attacks = graph(framework)
+    expected = brute_force_extensions(ids, attacks, semantics)
+
+    found = native_solver.parse_extensions(native_solver.solve(framework, "EE-" + semantics))
+    assert sorted(map(sorted, found)) == sorted(map(sorted, expected))
+
+    for arg_id in ids + [max(ids) + 1]:
+        skeptical = all(arg_id in extension for extension in expected)
+        credulous = any(arg_id in extension for extension in expected)
+        for mode, answer in (("DS", skeptical), ("DC", credulous)):
+            problem = "{}-{}".format(mode, semantics)
+            expected_output = "YES\n" if answer else "NO\n"
+            assert native_solver.solve(framework, problem, str(arg_id)) == expected_output
+            # run_solver also goes through the kernel and the grounded fast path.
+            assert framework.run_solver(problem, str(arg_id), backend="native") == expected_output
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("semantics", ["GR", "PR"])
+@pytest.mark.parametrize("skeptical", [True, False])
+def test_batch_and_incremental_match_brute_force(seed, semantics, skeptical):
+    rng = random.Random(seed)
+    framework = random_framework(rng)
+    ids, attacks = graph(framework)
+    masks = np.random.default_rng(seed).random((12, len(ids))) < 0.7
+    query = rng.choice(ids)
+
+    expected = []
+    for mask in masks:
+        kept = [arg_id for arg_id, keep in zip(ids, mask) if keep]
+        extensions = brute_force_extensions(kept, {(a, b) for a, b in attacks if a in kept and b in kept}, semantics)
+        if skeptical:
+            expected.append(all(query in extension for extension in extensions))
+        else:
+            expected.append(any(query in extension for extension in extensions))
+
+    batch = native_solver.batch_accepted(framework, masks, query, semantics=semantics, skeptical=skeptical)
+    incremental = native_solver.incremental_accepted(framework, masks, query, semantics=semantics,
+                                                     skeptical=skeptical)
+    assert batch.tolist() == expected
+    assert incremental.tolist() == expected
@@ -0,0 +1,93 @@
+"""
+Cross-checks power_index against the definitions of the Shapley value and the Banzhaf index, enumerated over all
+permutations and coalitions of small games.
+"""
+import itertools
+import math
+import random
+
+import numpy as np
+import pytest
+
+import power_index
+from test_native_solver import brute_force_extensions, graph, random_framework
+
+SEEDS = range(20)
+
+
+def random_game(rng, max_players=6):
+    """
+    :return: Boolean incidence matrix with a few, possibly repeated, winning coalitions.
+    """
+    n = rng.randint(1, max_players)
+    return np.array([[rng.random() < 0.5 for _ in range(n)] for _ in range(rng.randint(1, 5))], dtype=bool)
+
+
+def brute_force_indices(winning, n):
+    """
+    :param winning: Set of winning coalitions, as frozensets of player indices.
+    :return: Tuple (Shapley values, Banzhaf indices), as lists.
+    """
+    value = lambda coalition: 1.0 if coalition in winning else 0.0
+    shapley = [0.0] * n
+    for permutation in itertools.permutations(range(n)):
+        for position, player in enumerate(permutation):
+            before = frozenset(permutation[:position])
+            shapley[player] += value(before | {player}) - value(before)
+    banzhaf = [0.0] * n
+    for player in range(n):
+        others = [i for i in range(n) if i != player]
+        for size in range(n):
+            for coalition in map(frozenset, itertools.combinations(others, size)):
+                banzhaf[player] += value(coalition | {player}) - value(coalition)
+    return [s / math.factorial(n) for s in shapley], [b / 2 ** (n - 1) for b in banzhaf]
+
+
+def coalitions(incidence):
+    return {frozenset(np.flatnonzero(row).tolist()) for row in incidence}
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_exact_indices_match_definitions(seed):
+    incidence = random_game(random.Random(seed))
+    shapley, banzhaf = brute_force_indices(coalitions(incidence), incidence.shape[1])
+    assert np.allclose(power_index.shapley_values(incidence), shapley)
+    assert np.allclose(power_index.banzhaf_indices(incidence), banzhaf)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sampled_indices_converge(seed):
+    incidence = random_game(random.Random(seed), max_players=5)
+    shapley, banzhaf = brute_force_indices(coalitions(incidence), incidence.shape[1])
+    assert np.allclose(power_index.sampled_shapley_values(incidence, num_samples=20000, seed=seed), shapley,
+                       atol=0.03)
+    assert np.allclose(power_index.sampled_banzhaf_indices(incidence, num_samples=20000, seed=seed), banzhaf,
+                       atol=0.03)
+    # The same seed gives the same estimate.
+    assert np.array_equal(power_index.sampled_shapley_values(incidence, num_samples=100, seed=seed),
+                          power_index.sampled_shapley_values(incidence, num_samples=100, seed=seed))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("index", power_index.POWER_INDICES)
+def test_compute_power_index_matches_brute_force(seed, index):
+    framework = random_framework(random.Random(seed), max_arguments=6)
+    ids, attacks = graph(framework)
+    extensions = brute_force_extensions(ids, attacks, "PR")
+    position = {arg_id: i for i, arg_id in enumerate(ids)}
+    in_games = {frozenset(position[arg_id] for arg_id in extension) for extension in extensions}
+    out_games = {frozenset(position[b] for a, b in attacks if a in extension) for extension in extensions}
+    in_shapley, in_banzhaf = brute_force_indices(in_games, len(ids))
+    out_shapley, out_banzhaf = brute_force_indices(out_games, len(ids))
+    expected_in, expected_out = (in_shapley, out_shapley) if index == "SV" else (in_banzhaf, out_banzhaf)
+
+    power = power_index.compute_power_index(framework, index=index)
+    assert np.allclose([power[arg_id][0] for arg_id in ids], expected_in)
+    assert np.allclose([power[arg_id][1] for arg_id in ids], expected_out)
+
+
+def test_rank_order_and_unknown_index():
+    power = {3: (0.5, 0.1), 1: (0.5, 0.1), 2: (0.5, 0.0), 4: (0.7, 0.9), 5: (0.4999999, 0.1)}
+    assert power_index.rank(power) == [4, 2, 1, 3, 5]
+    with pytest.raises(ValueError):
+        power_index.compute_power_index(random_framework(random.Random(0)), index="XX")
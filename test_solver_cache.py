@@ -0,0 +1,113 @@
+"""
+Checks SolverCache hits, LRU and byte eviction, the EE bypass and canonical keys, and that cached run_solver answers
+match the native solver.
+"""
+import random
+
+import native_solver
+from argument import Argument, ArgumentationFramework, ArgumentationFrameworkView
+from solver_cache import SolverCache, canonical_key
+from test_native_solver import random_framework
+
+
+def framework_from(ids, attacks):
+    framework = ArgumentationFramework()
+    for arg_id in ids:
+        framework.add_argument(Argument(arg_id, str(arg_id)))
+    for attacker, attacked in attacks:
+        framework.add_attack(attacker, attacked)
+    return framework
+
+
+class CountingSolver:
+    def __init__(self, output="YES\n"):
+        self.output = output
+        self.calls = 0
+
+    def __call__(self, framework, semantics, arg_str):
+        self.calls += 1
+        return self.output
+
+
+def test_canonical_key_ignores_construction_order():
+    first = framework_from([1, 2, 3], [(1, 2), (2, 3), (3, 1)])
+    second = framework_from([3, 1, 2], [(3, 1), (1, 2), (2, 3)])
+    assert canonical_key(first, "DS-PR", "1") == canonical_key(second, "DS-PR", "1")
+    # A frozen copy and a view over a larger framework with the same content share the key too.
+    assert canonical_key(first.freeze(), "DS-PR", "1") == canonical_key(first, "DS-PR", "1")
+    larger = framework_from([1, 2, 3, 4], [(1, 2), (2, 3), (3, 1), (4, 1)])
+    view = ArgumentationFrameworkView(larger).without([4])
+    assert canonical_key(view, "DS-PR", "1") == canonical_key(first, "DS-PR", "1")
+
+    assert canonical_key(first, "DS-PR", "2") != canonical_key(first, "DS-PR", "1")
+    assert canonical_key(first, "DC-PR", "1") != canonical_key(first, "DS-PR", "1")
+    assert canonical_key(framework_from([1, 2, 3], [(1, 2), (2, 3)]), "DS-PR", "1") != \
+        canonical_key(first, "DS-PR", "1")
+
+
+def test_hits_and_misses():
+    cache = SolverCache()
+    solver = CountingSolver()
+    framework = framework_from([1, 2], [(1, 2)])
+    for _ in range(3):
+        assert cache.solve(framework, "DS-PR", "1", solver) == "YES\n"
+    assert solver.calls == 1
+    assert cache.stats() == {"size": 1, "bytes": 4, "hits": 2, "misses": 1, "hit_rate": 2 / 3}
+
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()["bytes"] == 0 and cache.stats()["hits"] == 0
+
+
+def test_least_recently_used_is_evicted_first():
+    cache = SolverCache(max_size=2)
+    cache.put("a", "YES\n")
+    cache.put("b", "NO\n")
+    assert cache.get("a") == "YES\n"
+    cache.put("c", "NO\n")
+    assert cache.get("b") is None
+    assert cache.get("a") == "YES\n" and cache.get("c") == "NO\n"
+    assert len(cache) == 2
+
+
+def test_byte_bound():
+    cache = SolverCache(max_bytes=10)
+    cache.put("a", "x" * 4)
+    cache.put("b", "x" * 4)
+    cache.put("c", "x" * 4)
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 8
+    # Replacing an entry frees the bytes of the old output.
+    cache.put("b", "x")
+    assert cache.stats()["bytes"] == 5
+    # Outputs larger than max_bytes are not stored and evict nothing.
+    cache.put("d", "x" * 11)
+    assert cache.get("d") is None
+    assert cache.get("b") == "x" and cache.get("c") == "x" * 4
+
+
+def test_enumeration_is_not_cached():
+    cache = SolverCache()
+    solver = CountingSolver("[[1]]\n")
+    framework = framework_from([1, 2], [(1, 2)])
+    for _ in range(2):
+        assert cache.solve(framework, "EE-PR", "", solver) == "[[1]]\n"
+    assert solver.calls == 2
+    assert len(cache) == 0
+
+
+def test_cached_run_solver_matches_native_solver():
+    cache = SolverCache()
+    ArgumentationFramework.solver_cache = cache
+    try:
+        rng = random.Random(0)
+        for _ in range(30):
+            framework = random_framework(rng)
+            for problem in ("DS-PR", "DC-PR", "DS-CO"):
+                arg_str = str(rng.choice(list(framework.argument_ids())))
+                expected = native_solver.solve(framework, problem, arg_str)
+                # The second call is answered from the cache.
+                assert framework.run_solver(problem, arg_str, backend="native") == expected
+                assert framework.run_solver(problem, arg_str, backend="native") == expected
+        assert cache.hits >= 90
+    finally:
+        ArgumentationFramework.solver_cache = None
@@ -0,0 +1,85 @@
+"""
+Checks SolverPool against direct solving, and its timeout and restart handling with a stand-in external solver.
+"""
+import os
+import random
+import sys
+import time
+
+import pytest
+
+import native_solver
+from argument import Argument, ArgumentationFramework
+from solver_pool import SolverPool
+
+# Stand-in for an ICCMA solver: answers YES at once, except for DS-PR, where it records its pid and hangs.
+STAND_IN_SOLVER = """
+import os, sys, time
+if "DS-PR" in sys.argv:
+    with open(sys.argv[1], "w") as file:
+        file.write(str(os.getpid()))
+    time.sleep(20)
+print("YES")
+"""
+
+
+def framework_from(ids, attacks):
+    framework = ArgumentationFramework()
+    for arg_id in ids:
+        framework.add_argument(Argument(arg_id, str(arg_id)))
+    for attacker, attacked in attacks:
+        framework.add_attack(attacker, attacked)
+    return framework
+
+
+def is_running(pid):
+    try:
+        with open("/proc/{}/stat".format(pid)) as file:
+            return file.read().split(")")[-1].split()[0] not in ("Z", "X")
+    except FileNotFoundError:
+        return False
+
+
+def test_pool_matches_direct_solving():
+    rng = random.Random(0)
+    requests = []
+    for key in range(30):
+        ids = rng.sample(range(1, 20), rng.randint(2, 8))
+        attacks = [(rng.choice(ids), rng.choice(ids)) for _ in range(2 * len(ids))]
+        semantics = rng.choice(["DS-PR", "DC-PR", "DS-CO", "EE-PR", "EE-GR"])
+        arg_str = "" if semantics.startswith("EE") else str(rng.choice(ids))
+        requests.append((key, framework_from(ids, attacks), semantics, arg_str))
+
+    with SolverPool(num_workers=2) as pool:
+        results = dict(pool.imap_unordered(requests))
+
+    for key, framework, semantics, arg_str in requests:
+        expected = native_solver.solve(framework, semantics, arg_str)
+        if semantics.startswith("EE"):
+            assert sorted(map(sorted, native_solver.parse_extensions(results[key]))) == \
+                sorted(map(sorted, native_solver.parse_extensions(expected)))
+        else:
+            assert results[key] == expected
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg") or not os.path.isdir("/proc"), reason="needs POSIX process groups")
+def test_timeout_kills_solver_and_resends_pending(tmp_path):
+    script = tmp_path / "solver.py"
+    script.write_text(STAND_IN_SOLVER)
+    pid_file = tmp_path / "pid"
+    # A two-cycle leaves argument 1 undecided, so the grounded fast path cannot answer and the solver is called.
+    framework = framework_from([1, 2], [(1, 2), (2, 1)])
+    requests = [("hangs", framework, "DS-PR", "1"), ("first", framework, "DC-PR", "1"),
+                ("second", framework, "DC-PR", "1")]
+
+    with SolverPool(num_workers=1, command=[sys.executable, str(script), str(pid_file)], queue_depth=3,
+                    timeout=1) as pool:
+        results = dict(pool.imap_unordered(requests))
+        assert pool.restarts == 1
+
+    assert results == {"hangs": None, "first": "YES\n", "second": "YES\n"}
+    pid = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while is_running(pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not is_running(pid)
@@ -0,0 +1,53 @@
+"""
+Cross-checks SparseGraph against plain Python graph searches on random frameworks, mutable and frozen.
+"""
+import random
+
+import pytest
+
+from sparse_graph import SparseGraph
+from test_native_solver import random_framework
+
+SEEDS = range(30)
+
+
+def closure(ids, attacks):
+    """
+    :return: Set of (a, b) pairs such that a attacks b through a path of one or more attacks (Floyd-Warshall).
+    """
+    reach = set(attacks)
+    for k in ids:
+        reach |= {(a, b) for a in ids if (a, k) in reach for b in ids if (k, b) in reach}
+    return reach
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("frozen", [False, True])
+def test_sparse_graph_matches_brute_force(seed, frozen):
+    rng = random.Random(seed)
+    framework = random_framework(rng, max_arguments=10)
+    ids = list(framework.argument_ids())
+    attacks = {(a, b) for a in ids for b in framework.arguments_attacked_by(a)}
+    graph = SparseGraph(framework.freeze() if frozen else framework)
+    assert sorted(graph.ids) == sorted(ids)
+
+    in_degrees = dict(zip(graph.ids, graph.in_degrees().tolist()))
+    out_degrees = dict(zip(graph.ids, graph.out_degrees().tolist()))
+    for arg_id in ids:
+        assert in_degrees[arg_id] == len({a for a, b in attacks if b == arg_id})
+        assert out_degrees[arg_id] == len({b for a, b in attacks if a == arg_id})
+    assert sorted(graph.unattacked()) == sorted(b for b in ids if in_degrees[b] == 0)
+
+    reach = closure(ids, attacks)
+    start = rng.sample(ids, rng.randint(1, len(ids)))
+    assert set(graph.reachable(start)) == set(start) | {b for a, b in reach if a in start}
+    assert set(graph.reachable(start, reverse=True)) == set(start) | {a for a, b in reach if b in start}
+
+    matrix = graph.transitive_closure()
+    assert {(graph.ids[i], graph.ids[j]) for i, j in zip(*matrix.nonzero())} == reach
+
+    components = graph.strongly_connected_components()
+    assert sorted(arg_id for component in components for arg_id in component) == sorted(ids)
+    for component in components:
+        for a in component:
+            assert {b for b in ids if b == a or ((a, b) in reach and (b, a) in reach)} == set(component)